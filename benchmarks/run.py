@@ -0,0 +1,174 @@
+"""
+Benchmark the plugin over a synthetic blog.
+
+A throwaway git repository is generated (see `synthetic.py`), and the hooks
+of `BloggingPlugin` are driven over its pages the way `mkdocs build` does.
+Only git and the requirements of the plugin are needed.
+
+Example:
+
+    python benchmarks/run.py --posts 4000 --commits 8000 --output after.json --compare before.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import mkdocs  # noqa: E402
+from mkdocs.config import load_config  # noqa: E402
+from mkdocs.structure.files import get_files  # noqa: E402
+from mkdocs.structure.pages import Page  # noqa: E402
+
+from benchmarks.synthetic import generate_blog  # noqa: E402
+from mkdocs_blogging_plugin.plugin import BloggingPlugin  # noqa: E402
+from mkdocs_blogging_plugin.util import Util  # noqa: E402
+
+PHASES = ["timestamps", "page_markdown", "category_index", "related", "post_page",
+          "category_render", "tags_render"]
+
+
+def run_once(config_file: str, site_dir: str) -> dict:
+    """Drive the hooks of a fresh plugin over all pages, and time each phase."""
+    config = load_config(config_file=config_file, site_dir=site_dir)
+    files = get_files(config)
+    pages = [Page(None, file, config) for file in files.documentation_pages()]
+
+    plugin = BloggingPlugin()
+    plugin.config = dict(config["plugins"]["blogging"].config)
+    # Start from a cold cache, as a new `mkdocs build` does
+    Util.get_git_commit_timestamps.cache_clear()
+    Util.get_date_formatter.cache_clear()
+
+    timings = {}
+    plugin.on_config(config)
+    plugin.profiler.enabled = True
+
+    start = time.perf_counter()
+    plugin.on_files(files, config=config)
+    timings["timestamps"] = time.perf_counter() - start
+
+    timings["page_markdown"] = 0.0
+    timings["category_index"] = 0.0
+    for page in pages:
+        page.read_source(config)
+        start = time.perf_counter()
+        page.markdown = plugin.on_page_markdown(page.markdown, page=page, config=config, files=files)
+        timings["page_markdown"] += time.perf_counter() - start
+
+        page.render(config, files)
+        start = time.perf_counter()
+        page.content = plugin.on_page_content(page.content, page=page, config=config,
+                                              files=files) or page.content
+        timings["category_index"] += time.perf_counter() - start
+
+    timings["related"] = 0.0
+    timings["post_page"] = 0.0
+    for page in pages:
+        start = time.perf_counter()
+        plugin.on_page_context({}, page=page, config=config, nav=None)
+        timings["related"] += time.perf_counter() - start
+
+        output = f"<html><body>{page.content}</body></html>"
+        start = time.perf_counter()
+        plugin.on_post_page(output, page=page, config=config)
+        timings["post_page"] += time.perf_counter() - start
+
+    renders = plugin.profiler.renders
+    timings["category_render"] = sum(seconds for key, seconds in renders.items()
+                                      if key.startswith("blog"))
+    # Keyed by the kind of index, e.g. "tags False"
+    timings["tags_render"] = sum(seconds for key, seconds in renders.items()
+                                  if key.startswith("tags"))
+    return {"timings": timings, "counters": dict(plugin.profiler.counters)}
+
+
+def summarize(runs: list) -> dict:
+    return {
+        phase: {
+            "min": min(run["timings"][phase] for run in runs),
+            "mean": statistics.mean(run["timings"][phase] for run in runs),
+            "runs": [run["timings"][phase] for run in runs],
+        }
+        for phase in PHASES
+    }
+
+
+def compare(results: dict, baseline: dict):
+    print(f"\n{'phase':<18}{'baseline':>12}{'current':>12}{'ratio':>10}")
+    for phase in PHASES:
+        if phase not in baseline["results"]:
+            continue
+        old = baseline["results"][phase]["min"]
+        new = results["results"][phase]["min"]
+        ratio = f"{new / old:.2f}x" if old else "-"
+        print(f"{phase:<18}{old:>11.4f}s{new:>11.4f}s{ratio:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--commits", type=int, default=2000)
+    parser.add_argument("--renames", type=int, default=100)
+    parser.add_argument("--categories", type=int, default=4)
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument("--tags-per-post", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Path of the JSON results")
+    parser.add_argument("--compare", help="Path of JSON results to compare with")
+    parser.add_argument("--keep", help="Generate the repository in this directory and keep it")
+    args = parser.parse_args()
+    logging.getLogger("mkdocs").setLevel(logging.ERROR)
+
+    parameters = {
+        "posts": args.posts, "commits": args.commits, "renames": args.renames,
+        "categories": args.categories, "tags": args.tags,
+        "tags_per_post": args.tags_per_post, "seed": args.seed,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = args.keep or os.path.join(tmp, "blog")
+        start = time.perf_counter()
+        config_file = generate_blog(repo, **parameters)
+        print(f"Generated {args.posts} posts in {args.commits} commits "
+              f"in {time.perf_counter() - start:.2f}s")
+
+        runs = [run_once(config_file, os.path.join(tmp, "site")) for _ in range(args.repeat)]
+
+    git_version = subprocess.run(["git", "--version"], stdout=subprocess.PIPE,
+                                 universal_newlines=True).stdout.strip()
+    results = {
+        "parameters": parameters,
+        "environment": {
+            "python": platform.python_version(),
+            "mkdocs": mkdocs.__version__,
+            "git": git_version,
+            "platform": platform.platform(),
+        },
+        "results": summarize(runs),
+        "counters": runs[-1]["counters"],
+    }
+
+    for phase, summary in results["results"].items():
+        print(f"{phase:<18}min {summary['min']:.4f}s  mean {summary['mean']:.4f}s")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
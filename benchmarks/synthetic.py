@@ -0,0 +1,138 @@
+"""Generator of throwaway git repositories holding a synthetic blog."""
+import os
+import random
+import subprocess
+from typing import List
+
+START_TIMESTAMP = 1500000000
+COMMIT_INTERVAL = 3600
+
+
+def generate_blog(path: str, posts: int = 1000, commits: int = 2000, renames: int = 100,
+                  categories: int = 4, tags: int = 50, tags_per_post: int = 3,
+                  seed: int = 0) -> str:
+    """
+    Create a git repository with a blog at `path`.
+
+    The posts are spread over the categories, each in its own directory, and
+    created over the first half of the commits. The remaining commits edit
+    random posts, some of them renaming the post as well.
+
+    Args:
+        path (str): Directory to create the repository in.
+        posts (int): Number of posts.
+        commits (int): Number of commits, at least one per post created.
+        renames (int): Number of renamed posts.
+        categories (int): Number of categories.
+        tags (int): Number of distinct tags.
+        tags_per_post (int): Number of tags of each post.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        str: Path of the generated `mkdocs.yml`.
+    """
+    rng = random.Random(seed)
+    commits = max(commits, 1)
+    tag_names = [f"tag-{i}" for i in range(tags)]
+    # Earlier tags are more popular, like in real blogs
+    tag_weights = [1 / (i + 1) for i in range(tags)]
+
+    post_paths = [f"docs/c{i % categories}/post-{i}.md" for i in range(posts)]
+    post_tags = [sorted(set(rng.choices(tag_names, tag_weights, k=tags_per_post)))
+                 if tags else [] for _ in range(posts)]
+    revisions = [0] * posts
+
+    os.makedirs(path, exist_ok=True)
+    _run(path, "git", "init", "-q")
+
+    # Create all commits with a single fast-import stream
+    stream: List[bytes] = []
+    creating_commits = max(1, min(posts, commits // 2))
+    created = 0
+    renamed = 0
+    for commit in range(commits):
+        timestamp = START_TIMESTAMP + commit * COMMIT_INTERVAL
+        changes: List[bytes] = []
+
+        # Create the posts over the first commits
+        target = posts * (commit + 1) // creating_commits if commit < creating_commits else posts
+        while created < target:
+            changes.append(_modify(post_paths[created],
+                                   _post(created, post_tags[created], revisions[created])))
+            created += 1
+
+        if commit >= creating_commits and posts:
+            index = rng.randrange(posts)
+            if renamed < renames and rng.random() < renames / (commits - creating_commits):
+                old_path = post_paths[index]
+                post_paths[index] = f"{os.path.dirname(old_path)}/renamed-{renamed}-{index}.md"
+                changes.append(f"D {old_path}\n".encode("utf-8"))
+                renamed += 1
+            revisions[index] += 1
+            changes.append(_modify(post_paths[index],
+                                   _post(index, post_tags[index], revisions[index])))
+
+        if commit == 0:
+            changes.append(_modify("mkdocs.yml", _mkdocs_config(categories, bool(tags))))
+            changes.append(_modify("docs/index.md", b"# Blog\n\n{{ blog_content }}\n"))
+            changes.append(_modify("docs/tags.md", b"# Tags\n\n{{ tag_content }}\n"))
+            for category in range(1, categories):
+                changes.append(_modify(
+                    f"docs/c{category}.md",
+                    f"# Category {category}\n\n{{{{ blog_content c{category} }}}}\n".encode("utf-8")))
+
+        message = f"Commit {commit}".encode("utf-8")
+        stream.append(b"commit refs/heads/main\n")
+        stream.append(f"author Bench <bench@example.com> {timestamp} +0000\n".encode("utf-8"))
+        stream.append(f"committer Bench <bench@example.com> {timestamp} +0000\n".encode("utf-8"))
+        stream.append(b"data %d\n%s\n" % (len(message), message))
+        stream.extend(changes)
+        stream.append(b"\n")
+
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input=b"".join(stream),
+                   check=True)
+    _run(path, "git", "symbolic-ref", "HEAD", "refs/heads/main")
+    _run(path, "git", "reset", "-q", "--hard")
+
+    return os.path.join(path, "mkdocs.yml")
+
+
+def _run(path: str, *command: str):
+    subprocess.run(command, cwd=path, check=True, stdout=subprocess.DEVNULL)
+
+
+def _modify(path: str, content: bytes) -> bytes:
+    return b"M 100644 inline %s\ndata %d\n%s\n" % (path.encode("utf-8"), len(content), content)
+
+
+def _post(index: int, tags: List[str], revision: int) -> bytes:
+    tags_line = f"tags: [{', '.join(tags)}]\n" if tags else ""
+    paragraphs = "\n\n".join(
+        f"Paragraph {i} of post {index}, revision {revision}. " + "Lorem ipsum dolor sit amet. " * 8
+        for i in range(5)
+    )
+    return (
+        f"---\ntitle: Post {index}\ndescription: Description of post {index}\n{tags_line}---\n\n"
+        f"{paragraphs}\n\n<!-- more -->\n\n![image](https://example.com/image-{index}.png)\n"
+    ).encode("utf-8")
+
+
+def _mkdocs_config(categories: int, tags: bool) -> bytes:
+    lines = [
+        "site_name: Benchmark",
+        "site_url: https://example.com/",
+        "plugins:",
+        "  - blogging:",
+        "      dirs: [c0]",
+        "      features:",
+    ]
+    if tags:
+        lines += ["        tags:", "          index_page: tags.md", "        related: {}"]
+    else:
+        lines[-1] += " {}"
+    lines.append("      categories:")
+    for category in range(1, categories):
+        lines += [f"        - name: c{category}", f"          dirs: [c{category}]"]
+    if categories <= 1:
+        lines[-1] += " []"
+    return ("\n".join(lines) + "\n").encode("utf-8")
@@ -3,6 +3,7 @@ class BloggingConfig:
     size: int
     sort: dict
     paging: bool
+    static_paging: bool
     show_total: bool
     template: str
     theme: dict
@@ -13,7 +14,8 @@ class BloggingConfig:
         self.size = config.get("size", 10)
         self.sort = config.get("sort", {"from": "new", "by": "creation"})
         self.paging = config.get("paging", True)
+        self.static_paging = config.get("static_paging", False)
         self.show_total = config.get("show_total", True)
         self.template = config.get("template")
-        self.theme = config.get("theme")    
+        self.theme = config.get("theme")
         self.full_content = config.get("full_content", False)
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""Excerpts of rendered pages, used in place of their full content."""
+from html.parser import HTMLParser
+from typing import List, Optional
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+ELLIPSIS = "…"
+
+
+class _ExcerptParser(HTMLParser):
+    """Find where to cut the html, and the tags open at that point."""
+
+    def __init__(self, html: str, max_length: int = None, max_blocks: int = None):
+        super().__init__(convert_charrefs=False)
+        self.max_length = max_length
+        self.max_blocks = max_blocks
+        self.length = 0
+        self.blocks = 0
+        self.stack: List[str] = []
+        # Offset to cut the html at, and the text to append there
+        self.cut: Optional[int] = None
+        self.suffix = ""
+
+        self.line_offsets = [0]
+        for index, char in enumerate(html):
+            if char == "\n":
+                self.line_offsets.append(index + 1)
+
+    def position(self) -> int:
+        line, column = self.getpos()
+        return self.line_offsets[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        if self.cut is not None:
+            return
+        if not self.stack:
+            self.blocks += 1
+            if self.max_blocks is not None and self.blocks > self.max_blocks:
+                self.cut = self.position()
+                return
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if self.cut is not None or tag not in self.stack:
+            return
+        while self.stack.pop() != tag:
+            pass
+
+    def handle_data(self, data):
+        if self.cut is not None or data.isspace():
+            return
+        if self.max_length is not None and self.length + len(data) > self.max_length:
+            text = data[:self.max_length - self.length]
+            # Avoid cutting in the middle of a word
+            text = text[:text.rindex(" ")].rstrip() if " " in text else ""
+            self.cut = self.position() + len(text)
+            self.suffix = ELLIPSIS
+            return
+        self.length += len(data)
+
+    def handle_entityref(self, name):
+        # Entities count as a single character, and are never cut
+        self.handle_data("&")
+
+    def handle_charref(self, name):
+        self.handle_data("&")
+
+
+def get_excerpt(html: str, separator: str = None, max_length: int = None,
+                max_blocks: int = None) -> Optional[str]:
+    """
+    Cut the html of a page into an excerpt, closing the tags left open.
+
+    Args:
+        html (str): The rendered content of the page.
+        separator (str): Marker to cut the html at, e.g. `<!-- more -->`.
+        max_length (int): Maximum number of characters of text, used without a separator.
+        max_blocks (int): Maximum number of top-level elements, used without a separator.
+
+    Returns:
+        str: The excerpt, or None if the whole content fits.
+    """
+    if separator and separator in html:
+        html = html[:html.index(separator)]
+        parser = _ExcerptParser(html)
+        parser.feed(html)
+        parser.cut = len(html)
+    elif max_length is not None or max_blocks is not None:
+        parser = _ExcerptParser(html, max_length, max_blocks)
+        parser.feed(html)
+        parser.close()
+        if parser.cut is None:
+            return None
+    else:
+        return None
+
+    return html[:parser.cut] + parser.suffix + "".join(f"</{tag}>" for tag in reversed(parser.stack))
@@ -0,0 +1,172 @@
+"""Feeds of the blogs, written to the output file entry by entry."""
+import json
+import re
+from datetime import datetime, timezone
+from email.utils import formatdate
+from typing import Iterable
+from urllib.parse import urljoin
+from xml.sax.saxutils import XMLGenerator
+
+from .media import ATTRIBUTE_PATTERN
+
+FORMATS = {
+    "atom": "atom.xml",
+    "rss": "rss.xml",
+    "json": "feed.json",
+}
+
+# Opening tags, with quoted attribute values possibly containing `>`
+TAG_PATTERN = re.compile(r"<([a-zA-Z][^\s/>]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>")
+LINK_ATTRIBUTES = {"href", "src", "poster", "srcset"}
+
+
+def absolute_links(html: str, base_url: str) -> str:
+    """
+    Resolve the relative links and sources in the html against `base_url`, the
+    url of the page it comes from, as feed readers show it out of the page.
+    """
+    def resolve(value, name) -> str:
+        if name != "srcset":
+            return urljoin(base_url, value)
+        # Comma separated sources, each with an optional descriptor
+        candidates = []
+        for candidate in value.split(","):
+            parts = candidate.strip().split(None, 1)
+            if parts:
+                candidates.append(" ".join([urljoin(base_url, parts[0])] + parts[1:]))
+        return ", ".join(candidates)
+
+    def replace_attribute(attr):
+        name = attr.group(2).lower()
+        if name not in LINK_ATTRIBUTES or not attr.group(3):
+            return attr.group(0)
+        value = attr.group(3).split("=", 1)[1].strip()
+        quote = value[0] if value[0] in "\"'" else ""
+        value = resolve(value.strip(quote) if quote else value, name)
+        return f"{attr.group(1)}{attr.group(2)}={quote}{value}{quote}"
+
+    def replace(match):
+        tag, attrs = match.group(1), match.group(2)
+        return f"<{tag}{ATTRIBUTE_PATTERN.sub(replace_attribute, attrs)}>"
+
+    return TAG_PATTERN.sub(replace, html)
+
+
+def _iso_date(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def _element(writer: XMLGenerator, name: str, text: str = None, attrs: dict = None):
+    writer.startElement(name, attrs or {})
+    if text:
+        writer.characters(text)
+    writer.endElement(name)
+
+
+def write_atom(file, feed: dict, entries: Iterable[dict]):
+    """
+    Write an Atom feed.
+
+    Args:
+        file: Binary file to write to.
+        feed (dict): `title`, `url` of the blog, `feed_url`, `updated` timestamp
+            and `author` name.
+        entries (Iterable[dict]): `title`, `url`, `published` and `updated`
+            timestamps, and optionally `summary` text and `content` html of
+            each entry.
+    """
+    writer = XMLGenerator(file, encoding="utf-8", short_empty_elements=True)
+    writer.startDocument()
+    writer.startElement("feed", {"xmlns": "http://www.w3.org/2005/Atom"})
+    _element(writer, "id", feed["feed_url"])
+    _element(writer, "title", feed["title"])
+    _element(writer, "updated", _iso_date(feed["updated"]))
+    _element(writer, "link", attrs={"href": feed["url"]})
+    _element(writer, "link", attrs={"href": feed["feed_url"], "rel": "self"})
+    # Required by Atom, for the entries without an author of their own
+    writer.startElement("author", {})
+    _element(writer, "name", feed["author"])
+    writer.endElement("author")
+    _element(writer, "generator", "mkdocs-blogging-plugin")
+
+    for entry in entries:
+        writer.startElement("entry", {})
+        _element(writer, "id", entry["url"])
+        _element(writer, "title", entry["title"])
+        _element(writer, "link", attrs={"href": entry["url"]})
+        _element(writer, "published", _iso_date(entry["published"]))
+        _element(writer, "updated", _iso_date(entry["updated"]))
+        if entry.get("summary"):
+            _element(writer, "summary", entry["summary"])
+        if entry.get("content"):
+            _element(writer, "content", entry["content"], {"type": "html"})
+        writer.endElement("entry")
+        writer.ignorableWhitespace("\n")
+
+    writer.endElement("feed")
+    writer.endDocument()
+
+
+def write_rss(file, feed: dict, entries: Iterable[dict]):
+    """Write an RSS 2.0 feed. See `write_atom` for the arguments."""
+    writer = XMLGenerator(file, encoding="utf-8", short_empty_elements=True)
+    writer.startDocument()
+    writer.startElement("rss", {"version": "2.0"})
+    writer.startElement("channel", {})
+    _element(writer, "title", feed["title"])
+    _element(writer, "link", feed["url"])
+    _element(writer, "description", feed.get("description") or feed["title"])
+    _element(writer, "lastBuildDate", formatdate(feed["updated"], usegmt=True))
+    _element(writer, "generator", "mkdocs-blogging-plugin")
+
+    for entry in entries:
+        writer.startElement("item", {})
+        _element(writer, "title", entry["title"])
+        _element(writer, "link", entry["url"])
+        _element(writer, "guid", entry["url"], {"isPermaLink": "true"})
+        _element(writer, "pubDate", formatdate(entry["published"], usegmt=True))
+        description = entry.get("content") or entry.get("summary")
+        if description:
+            _element(writer, "description", description)
+        writer.endElement("item")
+        writer.ignorableWhitespace("\n")
+
+    writer.endElement("channel")
+    writer.endElement("rss")
+    writer.endDocument()
+
+
+def write_json(file, feed: dict, entries: Iterable[dict]):
+    """Write a JSON Feed 1.1. See `write_atom` for the arguments."""
+    header = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": feed["title"],
+        "home_page_url": feed["url"],
+        "feed_url": feed["feed_url"],
+    }
+    # Leave the list of items open, and write them one by one
+    file.write(json.dumps(header, ensure_ascii=False)[:-1].encode("utf-8"))
+    file.write(b', "items": [')
+
+    for index, entry in enumerate(entries):
+        item = {
+            "id": entry["url"],
+            "url": entry["url"],
+            "title": entry["title"],
+            "date_published": _iso_date(entry["published"]),
+            "date_modified": _iso_date(entry["updated"]),
+        }
+        if entry.get("summary"):
+            item["summary"] = entry["summary"]
+        item["content_html"] = entry.get("content") or entry.get("summary") or ""
+        file.write(b",\n" if index else b"\n")
+        file.write(json.dumps(item, ensure_ascii=False).encode("utf-8"))
+
+    file.write(b"\n]}\n")
+
+
+WRITERS = {
+    "atom": write_atom,
+    "rss": write_rss,
+    "json": write_json,
+}
@@ -0,0 +1,88 @@
+"""Index of file timestamps built from a single walk over the git history."""
+from typing import Dict, List, Optional, Tuple
+
+# Marks the beginning of a commit in the output of `git log`, so that it
+# can be told apart from the NUL-separated `--name-status` entries.
+COMMIT_MARKER = "\x01"
+
+
+class HistoryIndex:
+    """Map of repository-relative paths to their creation and revision time.
+
+    The whole history of a repository is read with one `git log` call,
+    instead of one call per file, and renames are followed the same way
+    `git log --follow` does.
+    """
+
+    def __init__(self, head: str = None, entries: Dict[str, List[int]] = None):
+        # The commit the index was computed at
+        self.head = head
+        self.entries: Dict[str, List[int]] = entries or {}
+
+    def to_dict(self) -> dict:
+        return {"head": self.head, "entries": self.entries}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HistoryIndex":
+        return cls(data.get("head"), data.get("entries"))
+
+    def get(self, path: str) -> Optional[Tuple[int, int]]:
+        """
+        Get the timestamps of a file.
+
+        Args:
+            path (str): Path of the file, relative to the repository root.
+
+        Returns:
+            tuple: (first commit, last commit) in unix timestamp,
+                   or None if the file is not tracked.
+        """
+        entry = self.entries.get(path)
+        return (entry[0], entry[1]) if entry else None
+
+    def update(self, git, revision: str = "HEAD"):
+        """
+        Apply the commits in `revision` to the index.
+
+        Args:
+            git (Git): The git command wrapper of the repository.
+            revision (str): Revision range passed to `git log`.
+        """
+        # --reverse replays the commits from the oldest one, so the
+        # latest commit touching a file always wins.
+        output = git.log(
+            revision, "--reverse", "--name-status", "-M", "-z",
+            format=COMMIT_MARKER + "%at"
+        )
+        self.apply_log(output)
+
+    def apply_log(self, output: str):
+        """Apply the output of `git log --reverse --name-status -M -z`."""
+        timestamp = None
+        tokens = iter(output.split("\0"))
+        for token in tokens:
+            token = token.strip("\n")
+            if not token:
+                continue
+            if token.startswith(COMMIT_MARKER):
+                timestamp = int(token[len(COMMIT_MARKER):])
+                continue
+
+            status = token[0]
+            if status in ("R", "C"):
+                source, dest = next(tokens), next(tokens)
+                # A renamed file keeps its creation time; a copy is a new file
+                entry = self.entries.pop(source, None) if status == "R" else None
+                if entry:
+                    self.entries[dest] = [entry[0], timestamp]
+                else:
+                    self.entries[dest] = [timestamp, timestamp]
+                continue
+
+            path = next(tokens)
+            if status == "D":
+                self.entries.pop(path, None)
+            elif path in self.entries:
+                self.entries[path][1] = timestamp
+            else:
+                self.entries[path] = [timestamp, timestamp]
@@ -0,0 +1,130 @@
+"""Index structures to look up blog pages efficiently."""
+import heapq
+import math
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List
+
+
+class _Node:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.values: List[str] = []
+
+
+class DirectoryTrie:
+    """Map of directories to the categories including them.
+
+    Directories are stored by their path components, so that all
+    categories including a page are found by walking its path once.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+        # Order in which the categories are added
+        self.order: Dict[str, int] = {}
+
+    def add(self, directory: str, category: str):
+        self.order.setdefault(category, len(self.order))
+        node = self.root
+        for part in Path(directory).parts:
+            node = node.children.setdefault(part, _Node())
+        if category not in node.values:
+            node.values.append(category)
+
+    def find(self, path: str) -> List[str]:
+        """
+        Get the categories including a page.
+
+        Args:
+            path (str): Path of the page, relative to the docs directory.
+
+        Returns:
+            list: names of the categories, in the order they are added.
+        """
+        found = set(self.root.values)
+        node = self.root
+        for part in Path(path).parent.parts:
+            node = node.children.get(part)
+            if node is None:
+                break
+            found.update(node.values)
+
+        return sorted(found, key=self.order.get)
+
+
+class TagIndex:
+    """Inverted index of tags, to find the pages related to a page.
+
+    Two pages are related by the tags they share, each weighted by its
+    inverse document frequency, so that a rare tag counts more than a
+    popular one. Ties are broken by recency.
+    """
+
+    def __init__(self):
+        # Keys of the pages, by tag
+        self.postings: Dict[str, List[str]] = {}
+        # Tags and timestamp, by key of the page
+        self.tags: Dict[str, FrozenSet[str]] = {}
+        self.timestamps: Dict[str, float] = {}
+
+    def add(self, key: str, tags: Iterable[str], timestamp: float = 0):
+        if key in self.tags:
+            return
+        self.tags[key] = frozenset(tags)
+        self.timestamps[key] = timestamp
+        for tag in self.tags[key]:
+            self.postings.setdefault(tag, []).append(key)
+
+    def weight(self, tag: str) -> float:
+        return math.log(1 + len(self.tags) / len(self.postings[tag]))
+
+    def related(self, key: str, count: int) -> List[str]:
+        """
+        Get the pages sharing the most tags with a page.
+
+        Only the postings of the page's tags are visited, rarest first.
+        Popular tags weigh little, so their long postings are skipped once
+        the pages found so far score more than any other page could.
+
+        Args:
+            key (str): Key of the page.
+            count (int): Maximum number of pages.
+
+        Returns:
+            list: keys of the related pages, the most related first.
+        """
+        if count <= 0 or key not in self.tags:
+            return []
+
+        own = self.tags[key]
+        tags = sorted(own, key=lambda tag: len(self.postings[tag]))
+        weights = [self.weight(tag) for tag in tags]
+        # Highest score of a page not visited yet
+        remaining = sum(weights)
+        visited = {key}
+        # Scores by shared tags, summed in the same order for equal tags
+        scores: Dict[FrozenSet[str], float] = {}
+        # Min-heap of (score, timestamp, key) of the best pages
+        top: List[tuple] = []
+
+        for tag, weight in zip(tags, weights):
+            if len(top) == count and top[0][0] > remaining:
+                break
+            for other in self.postings[tag]:
+                if other in visited:
+                    continue
+                visited.add(other)
+                shared = own & self.tags[other]
+                score = scores.get(shared)
+                if score is None:
+                    score = scores[shared] = sum(w for t, w in zip(tags, weights) if t in shared)
+                item = (score, self.timestamps[other], other)
+                if len(top) < count:
+                    heapq.heappush(top, item)
+                elif item > top[0]:
+                    heapq.heapreplace(top, item)
+            remaining -= weight
+
+        return [other for _, _, other in sorted(top, reverse=True)]
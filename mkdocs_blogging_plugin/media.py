@@ -0,0 +1,52 @@
+"""Lazy loading of the media embedded in the content of articles."""
+import re
+
+# Opening tags of media, with quoted attribute values possibly containing `>`
+MEDIA_PATTERN = re.compile(
+    r"<(img|iframe|video|audio|source)\b((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>", flags=re.IGNORECASE)
+# Attributes of a tag, by name and optional value
+ATTRIBUTE_PATTERN = re.compile(r"(\s+)([^\s=/>]+)(\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'>]+))?")
+DEFERRED_SOURCES = {"src", "srcset", "poster"}
+# Marks the media deferred by `defer_media`, restored by `pagination.js`
+DEFERRED_ATTRIBUTE = "data-blogging-deferred"
+
+
+def lazy_media(html: str) -> str:
+    """
+    Let the browser load the media in the html when they are about to be shown,
+    unless specified otherwise.
+    """
+    def replace(match):
+        tag, attrs = match.group(1), match.group(2)
+        names = {attr.group(2).lower() for attr in ATTRIBUTE_PATTERN.finditer(attrs)}
+        extra = ""
+        name = tag.lower()
+        if name in ("img", "iframe") and "loading" not in names:
+            extra += ' loading="lazy"'
+        if name == "img" and "decoding" not in names:
+            extra += ' decoding="async"'
+        if name in ("video", "audio") and "preload" not in names:
+            extra += ' preload="none"'
+        return f"<{tag}{extra}{attrs}>" if extra else match.group(0)
+
+    return MEDIA_PATTERN.sub(replace, html)
+
+
+def defer_media(html: str) -> str:
+    """
+    Keep the media in the html from being loaded at all, by moving their sources
+    to `data-` attributes, until they are restored by `pagination.js`.
+    """
+    def replace_attribute(attr):
+        if attr.group(2).lower() not in DEFERRED_SOURCES:
+            return attr.group(0)
+        return f"{attr.group(1)}data-{attr.group(2)}{attr.group(3) or ''}"
+
+    def replace(match):
+        tag, attrs = match.group(1), match.group(2)
+        deferred = ATTRIBUTE_PATTERN.sub(replace_attribute, attrs)
+        if deferred == attrs:
+            return match.group(0)
+        return f"<{tag} {DEFERRED_ATTRIBUTE}{deferred}>"
+
+    return MEDIA_PATTERN.sub(replace, html)
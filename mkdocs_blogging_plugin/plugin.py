@@ -1,17 +1,42 @@
+import hashlib
+import heapq
+import itertools
+import json
 import logging
+import math
 import os
+import posixpath
 import re
+import time
+from collections.abc import Mapping
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
+from urllib.parse import urljoin
 
-from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from jinja2 import (Environment, FileSystemBytecodeCache, FileSystemLoader,
+                    Template, select_autoescape)
 from mkdocs.config import config_options
 from mkdocs.exceptions import PluginError
 from mkdocs.plugins import BasePlugin
+from mkdocs.utils import write_file
+from mkdocs.utils.meta import get_data
+
+try:
+    from mkdocs.plugins import event_priority
+except ImportError:  # mkdocs < 1.4
+    def event_priority(priority):
+        return lambda method: method
 
 from mkdocs_blogging_plugin.config import BloggingConfig
 
+from .excerpt import get_excerpt
+from .media import lazy_media
+from .index import DirectoryTrie, TagIndex
+from .profiling import profiled
+from .records import PageTimes, PostRecord
+from .search import INDEX_NONE, INDEX_TITLES, filter_search_index_file
 from .util import Util
 
 DIR_PATH = Path(os.path.dirname(os.path.realpath(__file__)))
@@ -19,13 +44,75 @@ BLOG_PAGE_PATTERN = re.compile(
     r"\{\{\s*blog_content\s+(([0-9]|[a-z]|[A-Z]|-|_)*)\s*\}\}", flags=re.IGNORECASE)
 TAG_PAGE_PATTERN = re.compile(
     r"\{\{\s*tag_content\s*\}\}", flags=re.IGNORECASE)
+ARCHIVE_PAGE_PATTERN = re.compile(
+    r"\{\{\s*blog_archive\s+(([0-9]|[a-z]|[A-Z]|-|_)*)\s*\}\}", flags=re.IGNORECASE)
 THEMES = ["card", "button"]
-with open(DIR_PATH / "templates" / "pagination.js") as file:
-    SCRIPTS = "<script>" + file.read() + "</script>"
+EXCERPT_SEPARATOR = "<!-- more -->"
+# Change to invalidate the rendered fragments cached on disk
+FRAGMENT_CACHE_VERSION = 1
+STYLE_PATTERN = re.compile(r"<style[^>]*>(.*?)</style>", flags=re.IGNORECASE | re.DOTALL)
+
+
+@lru_cache(maxsize=None)
+def get_script_source() -> str:
+    """Script of the pagination, read on first use."""
+    with open(DIR_PATH / "templates" / "pagination.js") as file:
+        return file.read()
+
+
+@lru_cache(maxsize=None)
+def get_scripts() -> str:
+    return "<script>" + get_script_source() + "</script>"
+
+
+def get_asset_name(name, content) -> str:
+    """Name a file by its content, e.g. `blogging.0123abcd.css`, so that it can be cached forever."""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha1(content.encode('utf-8')).hexdigest()[:8]}{ext}"
+
+
+def get_config_digest(config) -> str:
+    """
+    Hash the mkdocs config, which templates can read through `mkdocs_context`,
+    leaving out what changes between runs, e.g. the addresses of objects.
+    """
+    def stable(value):
+        if isinstance(value, BasePlugin):
+            return stable(value.config)
+        if isinstance(value, Mapping):
+            return {str(key): stable(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [stable(item) for item in value]
+        if isinstance(value, (set, frozenset)):
+            return sorted(repr(stable(item)) for item in value)
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        if type(value).__repr__ is object.__repr__:
+            return type(value).__qualname__
+        return repr(value)
+
+    return hashlib.sha1(json.dumps(stable(config), sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
 
 logger = logging.getLogger("mkdocs.plugins")
 
 
+def get_sibling_path(dest_path, name) -> str:
+    """
+    Get the path of an extra page named `name`, written in the same
+    directory as the page at `dest_path`, so that the relative links
+    of the theme stay valid.
+    """
+    dest_dir, filename = posixpath.split(dest_path.replace(os.sep, "/"))
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(dest_dir, f"{name}.html" if stem == "index" else f"{stem}-{name}.html")
+
+
+def slugify(value) -> str:
+    slug = re.sub(r"\s+", "-", str(value).strip().lower())
+    return re.sub(r"[^\w\-]", "", slug)
+
+
 def get_config_scheme():
     # Using default values defined in BloggingConfig class
     c = BloggingConfig({})
@@ -36,6 +123,7 @@ def get_config_scheme():
         ("size", config_options.Type(int, default=c.size)),
         ("sort", config_options.Type(dict, default=c.sort)),
         ("paging", config_options.Type(bool, default=c.paging)),
+        ("static_paging", config_options.Type(bool, default=c.static_paging)),
         ("show_total", config_options.Type(bool, default=c.show_total)),
         ("template", config_options.Type(str, default=c.template)),
         ("theme", config_options.Type(dict, default=c.theme)),
@@ -60,6 +148,7 @@ class BloggingPlugin(BasePlugin):
     def __init__(self):
         self.config_scheme = get_config_scheme()
         self.util = Util()
+        self.profiler = self.util.profiler
 
         # Global configs
         self.site_url = ""
@@ -67,6 +156,7 @@ class BloggingPlugin(BasePlugin):
         self.time_format: str = None
         self.locale: str = None
         self.features: dict = {}
+        self.manifest_path: str = None
 
         # Global vars
         self.mkdocs_template_context = None
@@ -74,11 +164,33 @@ class BloggingPlugin(BasePlugin):
         self.tags_index_template = None
         self.tags_template = None
         self.tags = {}
+        self.sorted_tags = None
         self.tags_page_html = None
         self.tags_index_url = ""
+        self.tags_index_src = None
+        self.tags_index_dest = None
+        self.tags_directory_template = None
+        # Whether to write a page for each tag
+        self.tag_pages = False
+        # Paths of the tag pages by tag, distinct even if tags have the same slug
+        self.tag_paths: Dict[str, str] = {}
+        self.tag_path_set = set()
+        # Tags of the pages, to find related pages
+        self.tag_index = TagIndex()
+        self.tagged_pages: Dict[str, PostRecord] = {}
+
+        # Categories and tags to insert, by source path of the page
+        self.placeholders: Dict[str, dict] = {}
+        # Url of the first page showing each category
+        self.blog_urls: Dict[str, str] = {}
+        # How to index the pages with placeholders in search, by url
+        self.search_urls: Dict[str, str] = {}
+        # Newest records of each category, computed once all pages are read
+        self.recent_pages: Dict[str, List[PostRecord]] = None
 
         # Configs
         self.categories: Dict[str, BloggingConfig] = {}
+        self.category_trie = DirectoryTrie()
 
         # Blog pages
         self.pages = {
@@ -89,7 +201,31 @@ class BloggingPlugin(BasePlugin):
         }
 
         # Templates
+        self.jinja_env: Environment = None
+        self.jinja_env_key = None
         self.jinja_templates: Dict[str, Template] = {}
+        self.archive_template: Template = None
+
+        # States kept across rebuilds of `mkdocs serve`
+        self.config_snapshot = None
+        # Content hashes of the pages in current build, by source path
+        self.page_hashes: Dict[str, str] = {}
+        # (hash, times) of the pages by source path
+        self.timestamps: Dict[str, tuple] = {}
+        # (signature, html) of rendered blogs and tags, by key
+        self.render_cache: Dict[tuple, tuple] = {}
+        # Hash of the inputs of all rendered fragments, besides their pages,
+        # if the fragments are cached on disk
+        self.fragment_context: str = None
+        # Names of the fragment files used in current build
+        self.fragments_used = set()
+
+        # Styles and script written to files, by their path in the site
+        self.assets: Dict[str, str] = {}
+        # Urls of the stylesheets by category, and of tags
+        self.stylesheets: Dict[str, str] = {}
+        self.tags_stylesheet: str = None
+        self.script_url: str = None
 
     def read_in_config(self, global_config):
         # Return if the config has already been read
@@ -127,16 +263,17 @@ class BloggingPlugin(BasePlugin):
             )
 
         # Validate configs
-        # Check if paging is on in any category
+        # Check if script-based paging is on in any category
         has_paging = False
 
         for _, config in self.categories.items():
-            if config.paging:
+            if config.paging and not config.static_paging:
                 has_paging = True
                 break
 
         # Abort with error with 'navigation.instant' feature on
-        # because paging won't work with it.
+        # because paging won't work with it. Static paging is fine
+        # since it only uses plain links.
         mkdocs_theme = global_config.get("theme")
         if mkdocs_theme and "features" in mkdocs_theme and \
                 "navigation.instant" in mkdocs_theme["features"] and has_paging:
@@ -170,16 +307,55 @@ class BloggingPlugin(BasePlugin):
                     )
                     config.theme = None
 
+        # Index the directories of all categories
+        self.category_trie = DirectoryTrie()
+        for name, config in self.categories.items():
+            dirs = [config.dirs] if isinstance(config.dirs, str) else config.dirs
+            for dir in dirs:
+                self.category_trie.add(dir, name)
+
+        root_url = Path(global_config.get("config_file_path")).parents[0]
+
+        # Setup the on-disk cache
+        self.util.cache_dir = None
+        if "cache" in self.features:
+            cache_dir = self.features["cache"].get("dir", ".cache/blogging")
+            self.util.cache_dir = (root_url / cache_dir).as_posix()
+
+        # Read timestamps from the manifest, unless it is to be written
+        self.manifest_path = None
+        manifest = self.features.get("manifest")
+        if manifest is not None:
+            self.manifest_path = \
+                (root_url / manifest.get("path", "blogging-timestamps.json")).as_posix()
+        self.util.load_manifest(
+            self.manifest_path if manifest is not None and not manifest.get("export") else None,
+            global_config.get("docs_dir")
+        )
+
         # Setup jinja templates
         search_paths = [DIR_PATH / "templates"]
-        root_url = Path(global_config.get("config_file_path")).parents[0]
         search_paths += [(root_url / c.template).parents[0]
                          for _, c in self.categories.items() if c.template]
 
-        env = Environment(
-            loader=FileSystemLoader(search_paths),
-            autoescape=select_autoescape()
-        )
+        # Reuse the environment, along with the templates compiled by it, unless
+        # the search paths have changed. Modified templates are reloaded by
+        # the loader on `get_template`.
+        env_key = (search_paths, self.util.cache_dir)
+        if self.jinja_env is None or self.jinja_env_key != env_key:
+            bytecode_cache = None
+            if self.util.cache_dir:
+                bytecode_dir = os.path.join(self.util.cache_dir, "templates")
+                os.makedirs(bytecode_dir, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(bytecode_dir)
+
+            self.jinja_env = Environment(
+                loader=FileSystemLoader(search_paths),
+                autoescape=select_autoescape(),
+                bytecode_cache=bytecode_cache,
+            )
+            self.jinja_env_key = env_key
+        env = self.jinja_env
 
         for name, config in self.categories.items():
             jinja_template = env.get_template(
@@ -187,11 +363,15 @@ class BloggingPlugin(BasePlugin):
                 (f"blog-{config.theme['name']}-theme.html" if config.theme else "blog.html")
             )
             self.jinja_templates[name] = jinja_template
+        self.archive_template = env.get_template("blog-archive.html")
 
         # Setup tags
         self.tags_index_template = env.get_template("blog-tags-index.html")
         self.tags_template = env.get_template("blog-tags.html")
 
+        self.tags_directory_template = env.get_template("blog-tags-directory.html")
+
+        self.tag_pages = False
         if "tags" in self.features:
             index_path = self.features["tags"].get("index_page")
             if index_path:
@@ -202,6 +382,24 @@ class BloggingPlugin(BasePlugin):
                 # See https://www.mkdocs.org/user-guide/configuration/#use_directory_urls.
                 if global_config.get("use_directory_urls") == False:
                     self.tags_index_url += ".html"
+                    self.tags_index_dest = (index_path.parents[0] / index_path.stem).as_posix() + ".html"
+                elif index_path.stem == "index":
+                    self.tags_index_dest = (index_path.parents[0] / "index.html").as_posix()
+                else:
+                    self.tags_index_dest = \
+                        (index_path.parents[0] / index_path.stem / "index.html").as_posix()
+                self.tags_index_src = index_path.as_posix()
+
+            self.tag_pages = self.features["tags"].get("pages", False)
+            if self.tag_pages and not index_path:
+                logger.warning(
+                    "[blogging-plugin] Option 'pages' of tags requires 'index_page'. Ignoring..."
+                )
+                self.tag_pages = False
+        elif "related" in self.features:
+            logger.warning(
+                "[blogging-plugin] Feature 'related' requires feature 'tags'. Ignoring..."
+            )
 
     def on_serve(self, server, config, builder):
         self.read_in_config(config)
@@ -214,40 +412,222 @@ class BloggingPlugin(BasePlugin):
 
         return server
 
+    def on_startup(self, *, command, dirty):
+        # Defining this event keeps the plugin instance across rebuilds
+        # of `mkdocs serve`, so that unchanged pages can be reused.
+        pass
+
+    @profiled("on_config")
     def on_config(self, config):
+        self.profiler.reset()
+
         # Remove all pages to adapt live reload
         self.pages = {}
-        self.categories = {}
         self.tags = {}
+        self.sorted_tags = None
+        self.tags_page_html = None
+        self.tag_index = TagIndex()
+        self.tagged_pages = {}
+        self.tag_paths = {}
+        self.tag_path_set = set()
+        self.page_hashes = {}
+        self.placeholders = {}
+        self.blog_urls = {}
+        self.search_urls = {}
+        self.recent_pages = None
+
+        # Start over if the configuration, a custom template or
+        # the git history has changed
+        snapshot = self.get_config_snapshot(config)
+        if snapshot != self.config_snapshot or self.util.refresh():
+            self.categories = {}
+            self.timestamps = {}
+            self.render_cache = {}
+        self.config_snapshot = snapshot
 
         self.read_in_config(config)
+        self.profiler.enabled = "profile" in self.features
+        # Taken after the refresh and the manifest, which can clear the cache
+        self.lru_cache_info = Util.get_git_commit_timestamps.cache_info()
+
+        self.assets = {}
+        self.stylesheets = {}
+        self.tags_stylesheet = None
+        self.script_url = None
+        if "assets" in self.features:
+            self.setup_assets()
+
+        self.fragments_used = set()
+        self.fragment_context = None
+        if self.util.cache_dir:
+            self.fragment_context = self.get_fragment_context(config)
+
+    # After the search plugin has written its index
+    @event_priority(-100)
+    def on_post_build(self, config):
+        if self.search_urls:
+            filter_search_index_file(
+                os.path.join(config["site_dir"], "search", "search_index.json"), self.search_urls)
+
+        if self.fragment_context:
+            self.prune_fragments()
+
+        for path, content in self.assets.items():
+            write_file(content.encode("utf-8"), os.path.join(config["site_dir"], path))
+
+        if "feeds" in self.features:
+            self.write_feeds(config)
+
+        if self.manifest_path and self.features["manifest"].get("export"):
+            # All pages of this build, as the timestamps of any page can be queried
+            count = self.util.write_manifest(self.manifest_path, config["docs_dir"], self.page_hashes)
+            logger.info(f"[blogging-plugin] Timestamps of {count} pages "
+                        f"written to '{self.manifest_path}'")
+
+        if not self.profiler.enabled:
+            return
+
+        cache_info = Util.get_git_commit_timestamps.cache_info()
+        self.profiler.count("timestamp_lru_hits", cache_info.hits - self.lru_cache_info.hits)
+        self.profiler.count("timestamp_lru_misses", cache_info.misses - self.lru_cache_info.misses)
+
+        root_url = Path(config.get("config_file_path")).parents[0]
+        options = self.features["profile"]
+        path = root_url / options.get("path", "blogging-profile.json")
+        report = self.profiler.write(path, slowest=options.get("slowest", 10))
+
+        logger.info(f"[blogging-plugin] Build profile written to '{path}':")
+        for name, timing in sorted(report["timings"].items(),
+                                   key=lambda item: item[1]["time"], reverse=True):
+            logger.info(f"    {name}: {timing['time']:.3f}s in {timing['calls']} calls")
+        for name, value in sorted(report["counters"].items()):
+            logger.info(f"    {name}: {value}")
+
+    def get_config_snapshot(self, global_config):
+        root_url = Path(global_config.get("config_file_path")).parents[0]
+        templates = [self.config.get("template")] + [
+            c.get("template") for c in self.config.get("categories") or []
+            if isinstance(c, dict)
+        ]
+        mtimes = [os.path.getmtime(root_url / t) for t in templates
+                  if t and os.path.exists(root_url / t)]
+        # The manifest read instead of git logs
+        manifest = (self.config.get("features") or {}).get("manifest")
+        if manifest is not None and not manifest.get("export"):
+            path = root_url / manifest.get("path", "blogging-timestamps.json")
+            if os.path.exists(path):
+                mtimes.append(os.path.getmtime(path))
+
+        mkdocs_theme = global_config.get("theme")
+        theme_features = mkdocs_theme["features"] \
+            if mkdocs_theme and "features" in mkdocs_theme else None
+
+        return (
+            repr(dict(self.config)), mtimes, repr(theme_features),
+            global_config.get("site_url"), global_config.get("locale"),
+            global_config.get("use_directory_urls"), get_config_digest(global_config),
+        )
+
+    @profiled("on_files")
+    def on_files(self, files, config):
+        """
+        Resolve the timestamps of all pages that might be shown in the blog
+        concurrently, before the pages are processed one by one.
+        """
+        workers = self.features.get("prefetch", {}).get("workers")
+        if workers == 0:
+            return files
+
+        # Tagged pages can be anywhere; pages with a time in their meta don't need git
+        paths = [file.abs_src_path for file in files.documentation_pages()
+                 if ("tags" in self.features or self.get_categories(file.src_path))
+                 and self.get_source_time(file) is None]
+
+        if paths:
+            self.util.prefetch_git_commit_timestamps(paths, max_workers=workers)
+        return files
+
+    def get_source_time(self, file):
+        """Get the time in the meta section of a file, before its page is read."""
+        try:
+            with open(file.abs_src_path, encoding="utf-8-sig") as source:
+                _, meta = get_data(source.read())
+            return self.get_meta_time(meta)
+        except (OSError, ValueError):
+            # Reported when the page is read
+            return None
 
     def on_template_context(self, context, template_name, config):
         self.mkdocs_template_context = context
+        if "recent" in self.features:
+            context["recent_pages"] = self.get_recent_pages()
+        return context
+
+    @profiled("on_page_context")
+    def on_page_context(self, context, page, config, nav):
+        """Add the newest pages, and the pages related to this page by their tags."""
+        if "recent" in self.features:
+            context["recent_pages"] = self.get_recent_pages()
+        if "related" in self.features and "tags" in self.features:
+            count = self.features["related"].get("count", 5)
+            context["related_pages"] = [
+                self.tagged_pages[src_path]
+                for src_path in self.tag_index.related(page.file.src_path, count)
+            ]
         return context
 
+    @profiled("on_page_markdown")
     def on_page_markdown(self, markdown, page, config, files):
+        self.page_hashes[page.file.src_path] = hashlib.sha1(
+            (repr(sorted(page.meta.items())) + markdown).encode("utf-8")
+        ).hexdigest()
+
+        # Find the pages to insert the blog, archive or tags into
+        categories = []
+        for match in BLOG_PAGE_PATTERN.finditer(markdown):
+            category = match.group(1) or "global"
+            if category not in categories:
+                categories.append(category)
+        archives = []
+        for match in ARCHIVE_PAGE_PATTERN.finditer(markdown):
+            category = match.group(1) or "global"
+            if category not in archives:
+                archives.append(category)
+        has_tags = TAG_PAGE_PATTERN.search(markdown) is not None
+        for category in categories:
+            self.blog_urls.setdefault(category, page.canonical_url)
+        if categories or archives or has_tags:
+            self.placeholders[page.file.src_path] = {
+                "categories": categories, "archives": archives, "tags": has_tags
+            }
+
+            # Keep the blog or tags out of search, as they repeat the articles
+            if "search" in self.features:
+                index = self.features["search"].get("index", INDEX_TITLES)
+                if index not in (INDEX_TITLES, INDEX_NONE):
+                    logger.warning(
+                        f"[blogging-plugin] Unknown search index option '{index}'. "
+                        f"Using '{INDEX_TITLES}'..."
+                    )
+                    index = INDEX_TITLES
+                self.search_urls[page.url] = index
+                if index == INDEX_NONE:
+                    # Understood by the search plugin of mkdocs-material
+                    page.meta.setdefault("search", {"exclude": True})
+
         if "tags" in self.features and "tags" in page.meta:
-            tags = page.meta["tags"]
-            page = self.with_timestamp(
-                page, self.categories["global"].sort["by"] == "revision")
-            if isinstance(tags, list):
-                for tag in tags:
-                    if tag not in self.tags:
-                        self.tags[tag] = [page]
-                    else:
-                        self.tags[tag].append(page)
-            else:
-                logger.warning(
-                    f"[blogging-plugin] Tags entry '{tags}' is not a list. "
-                    "Skipping..."
-                )
+            # Give the tags their pages in the order they are found, before any link to them
+            if self.tag_pages and isinstance(page.meta["tags"], list):
+                for tag in page.meta["tags"]:
+                    self.get_tag_path(tag)
 
             # Insert tags into original page
             insert = self.features["tags"].get("insert")
             if insert:
                 tags_html = "\n" + self.tags_template.render(tags=page.meta["tags"],
-                                                             index_url=self.tags_index_url).strip() + "\n"
+                                                             index_url=self.tags_index_url,
+                                                             stylesheet=self.tags_stylesheet,
+                                                             tag_url=self.get_tag_url).strip() + "\n"
                 if insert == "bottom":
                     markdown = markdown + "\n<br/>\n" + tags_html
                 else:
@@ -255,99 +635,567 @@ class BloggingPlugin(BasePlugin):
 
         return markdown
 
+    @profiled("on_page_content")
     def on_page_content(self, html, page, config, files):
         """
         Add meta information about creation date after the html has
         been generated, the time when the meta from markdown file
         has already been added into the page instance.
         """
+        excluded = "exclude_from_blog" in page.meta and page.meta["exclude_from_blog"]
+        categories = [] if excluded else self.get_categories(page.file.src_path)
+        full_content = any(self.categories[name].full_content for name in categories)
+        if full_content and "lazy_media" in self.features:
+            html = lazy_media(html)
 
-        if "exclude_from_blog" in page.meta and page.meta["exclude_from_blog"]:
-            return
+        # Cut the content once for all blogs showing it
+        excerpt = self.features.get("excerpt")
+        if excerpt is not None and full_content:
+            page.meta["content-excerpt"] = get_excerpt(
+                html, separator=excerpt.get("separator", EXCERPT_SEPARATOR),
+                max_length=excerpt.get("max_length"), max_blocks=excerpt.get("max_blocks"))
 
-        file_path = Path(page.file.src_path)
+        # Only keep the content if it is shown
+        content = None
+        if (full_content and not page.meta.get("content-excerpt")) or \
+                self.features.get("feeds", {}).get("content"):
+            content = html
+        # Records sorted by either time, by `by_revision`, sharing the times resolved once
+        records = {}
 
-        for name, config in self.categories.items():
+        def get_record(by_revision):
+            if by_revision not in records:
+                times = self.get_cached_times(page)
+                records[by_revision] = PostRecord(page, times, by_revision, content)
+                # For templates reading the meta of pages, by the sort of the blog
+                self.with_timestamp(page, self.categories["global"].sort["by"] == "revision", times)
+            return records[by_revision]
+
+        # Tagged pages are collected even if excluded from the blog
+        if "tags" in self.features and "tags" in page.meta:
+            tags = page.meta["tags"]
+            if isinstance(tags, list):
+                record = get_record(self.categories["global"].sort["by"] == "revision")
+                for tag in tags:
+                    if tag not in self.tags:
+                        self.tags[tag] = [record]
+                    else:
+                        self.tags[tag].append(record)
+                self.tag_index.add(record.src_path, tags, record.timestamp)
+                self.tagged_pages[record.src_path] = record
+            else:
+                logger.warning(
+                    f"[blogging-plugin] Tags entry '{tags}' is not a list. "
+                    "Skipping..."
+                )
+
+        for name in self.categories:
             self.pages.setdefault(name, {"html": None, "pages": []})
-            for dir in config.dirs:
-                if Path(dir) in file_path.parents:
-                    self.pages[name]["pages"].append(
-                        self.with_timestamp(page, config.sort["by"] == "revision"))
-                    break
 
+        for name in categories:
+            config = self.categories[name]
+            self.pages[name]["pages"].append(get_record(config.sort["by"] == "revision"))
+
+    @profiled("on_post_page")
     def on_post_page(self, output, page, config):
-        match = BLOG_PAGE_PATTERN.search(output)
-        if match:
-            category = match.group(1)
-            if not category:
-                category = "global"
-            if category not in self.pages:
+        # Only pages with placeholders, found in `on_page_markdown`, need processing
+        placeholders = self.placeholders.get(page.file.src_path)
+        if not placeholders:
+            return output
+
+        if placeholders["tags"] and "tags" in self.features and self.tags:
+            if not self.tags_page_html:
+                self.tags_page_html = self.generate_tags_html()
+
+            # Write the pages of all tags from the index page
+            if self.tag_pages and page.file.src_path.replace(os.sep, "/") == self.tags_index_src:
+                self.write_tag_pages(output, config)
+
+            output = TAG_PAGE_PATTERN.sub(lambda _: self.tags_page_html, output)
+
+        categories = placeholders["categories"]
+        for category in categories + placeholders["archives"]:
+            if category not in self.categories:
                 raise PluginError(
                     f"[blogging-plugin] category '{category}' not found in configuration file"
                 )
+            self.pages.setdefault(category, {"html": None, "pages": []})
+
+        if placeholders["archives"]:
+            output = self.write_archive_pages(placeholders["archives"], output, page, config)
+
+        if categories:
+            # Only one category per page can be split into multiple files
+            static_categories = [category for category in categories
+                                 if self.categories[category].paging and
+                                 self.categories[category].static_paging]
+            # The other blogs are paged by the script, on every file
+            scripts = self.get_scripts_html() if len(categories) > min(len(static_categories), 1) else ""
+            if static_categories:
+                output = self.write_static_pages(static_categories[0], output, page, config, scripts)
+            else:
+                output = self.fill_blog_content(output)
+
+            output += scripts
+
+        return output
+
+    def get_sorted_tags(self) -> Dict[str, list]:
+        if self.sorted_tags is None:
+            self.sorted_tags = {tag: sorted(self.tags[tag],
+                                            key=lambda record: record.timestamp,
+                                            reverse=self.categories["global"].sort["from"] == "new"
+                                            )
+                                for tag in self.tags}
+        return self.sorted_tags
+
+    def generate_tags_html(self) -> str:
+        """Render the index of all tags, or the directory of tag pages."""
+        sorted_entries = self.get_sorted_tags()
+        template = self.tags_directory_template if self.tag_pages else self.tags_index_template
+        tag_names = [tag for tag in self.tags]
+
+        return self.render_cached(
+            ("tags", self.tag_pages), self.get_signature(sorted_entries.items()),
+            lambda: template.render(
+                tags=tag_names, entries=sorted_entries,
+                index_url=self.tags_index_url, tag_url=self.get_tag_url))
+
+    def write_tag_pages(self, output, config):
+        """Write a page for each tag next to the tags index page."""
+        for tag, entries in self.get_sorted_tags().items():
+            path = self.get_tag_path(tag)
+            html = self.render_cached(
+                ("tag", tag), self.get_signature([(tag, entries)]),
+                lambda: self.tags_index_template.render(
+                    tags=[tag], entries={tag: entries},
+                    index_url=self.tags_index_url, tag_url=self.get_tag_url))
+            result = self.fill_blog_content(TAG_PAGE_PATTERN.sub(lambda _: html, output))
+            write_file(result.encode("utf-8"), os.path.join(config["site_dir"], path))
+
+    def get_archive(self, category) -> List[tuple]:
+        """
+        Group the pages of a category by month, in a single pass over the sorted pages.
+
+        Returns:
+            list: (year, month, records) of each month with any page, in the order of the blog.
+        """
+        if "archive" not in self.pages[category]:
+            self.pages[category]["archive"] = [
+                (year, month, list(records)) for (year, month), records in itertools.groupby(
+                    self.get_sorted_pages(category),
+                    key=lambda record: datetime.fromtimestamp(record.timestamp).timetuple()[:2]
+                )
+            ]
+        return self.pages[category]["archive"]
+
+    def write_archive_pages(self, categories, output, page, config) -> str:
+        """
+        Write a page for each month of the archive of the categories next to
+        the page, and return the output of the page with the overviews.
+        """
+        formatter = Util.get_date_formatter(True, self.time_format, self.locale)
+        overviews = {}
+        months = []
+        for category in categories:
+            prefix = "archive" if category == "global" else f"archive-{category}"
+            years = []
+            for year, month, records in self.get_archive(category):
+                path = get_sibling_path(page.file.dest_path, f"{prefix}-{year}-{month:02d}")
+                entry = {
+                    "month": month, "label": formatter.format_month(year, month),
+                    "count": len(records), "url": urljoin(page.canonical_url, posixpath.basename(path)),
+                }
+                if not years or years[-1]["year"] != year:
+                    years.append({"year": year, "count": 0, "months": []})
+                years[-1]["count"] += len(records)
+                years[-1]["months"].append(entry)
+                months.append((category, year, month, records, path, entry))
+
+            # The overview only shows the months
+            overviews[category] = self.render_cached(
+                ("archive", category), (repr(years), page.canonical_url),
+                lambda: self.archive_template.render(archive=years, index_url=page.canonical_url))
+
+        for category, year, month, records, path, entry in months:
+            blog = self.render_blog(category, records, ("archive", category, year, month),
+                                    paging=False, page_size=len(records))
+            html = self.archive_template.render(month=entry, blog=blog, index_url=page.canonical_url)
+            result = ARCHIVE_PAGE_PATTERN.sub(
+                lambda match: html if (match.group(1) or "global") == category else
+                overviews[match.group(1) or "global"], output)
+            result = self.fill_blog_content(result)
+            if self.placeholders[page.file.src_path]["categories"]:
+                result += self.get_scripts_html()
+            write_file(result.encode("utf-8"), os.path.join(config["site_dir"], path))
+
+        return ARCHIVE_PAGE_PATTERN.sub(lambda match: overviews[match.group(1) or "global"], output)
+
+    def get_tag_path(self, tag) -> str:
+        """Path of the page of a tag, suffixed with a counter if its slug is taken by another tag."""
+        if tag not in self.tag_paths:
+            slug = "tag-" + slugify(tag)
+            name, count = slug, 1
+            while name in self.tag_path_set:
+                count += 1
+                name = f"{slug}-{count}"
+            self.tag_path_set.add(name)
+            self.tag_paths[tag] = get_sibling_path(self.tags_index_dest, name)
+        return self.tag_paths[tag]
+
+    def get_tag_url(self, tag) -> str:
+        if self.tag_pages:
+            return self.site_url + self.get_tag_path(tag)
+        return f"{self.tags_index_url}#{tag}"
+
+    def fill_blog_content(self, output, overrides=None) -> str:
+        """
+        Replace every `{{ blog_content <category> }}` with the blog of its category,
+        or with the html in `overrides` if provided for the category.
+        """
+        overrides = overrides or {}
 
+        def replace(match):
+            category = match.group(1) or "global"
+            if category in overrides:
+                return overrides[category]
             if self.pages[category]["html"] is None:
                 self.pages[category]["html"] = self.generate_html(category)
+            return self.pages[category]["html"]
 
-            result = BLOG_PAGE_PATTERN.sub(
-                self.pages[category]["html"],
-                output,
-            )
+        return BLOG_PAGE_PATTERN.sub(replace, output)
 
-            output = result + SCRIPTS
+    def write_static_pages(self, category, output, page, config, scripts="") -> str:
+        """
+        Split the blog of a category into separate files, each containing
+        a single page of entries, and return the output of the first one.
 
-        if "tags" in self.features and self.tags:
-            if not self.tags_page_html:
-                tag_names = [tag for tag in self.tags]
-                sorted_entries = {tag: sorted(self.tags[tag],
-                                              key=lambda page: page.meta["git-timestamp"],
-                                              reverse=self.categories["global"].sort["from"] == "new"
-                                              )
-                                  for tag in self.tags}
+        The other pages are written next to the index page, so that the
+        relative links of the theme stay valid, with `scripts` appended.
+        """
+        size = self.categories[category].size
+        page_num = 1
+        if size > 0:
+            page_num = max(1, math.ceil(len(self.pages[category]["pages"]) / size))
 
-                self.tags_page_html = self.tags_index_template.render(
-                    tags=tag_names, entries=sorted_entries,
-                    index_url=self.tags_index_url)
+        paths = [page.file.dest_path] + [
+            get_sibling_path(page.file.dest_path, f"page-{num}") for num in range(2, page_num + 1)
+        ]
+        page_urls = [page.canonical_url] + [
+            urljoin(page.canonical_url, posixpath.basename(path)) for path in paths[1:]
+        ]
 
-            output = TAG_PAGE_PATTERN.sub(self.tags_page_html, output)
+        for current_page in range(1, page_num):
+            html = self.generate_html(category, current_page, page_urls)
+            write_file((self.fill_blog_content(output, {category: html}) + scripts).encode("utf-8"),
+                       os.path.join(config["site_dir"], paths[current_page]))
 
-        return output
+        html = self.generate_html(category, 0, page_urls)
+        return self.fill_blog_content(output, {category: html})
 
-    def generate_html(self, category) -> str:
-        config = self.categories[category]
+    @profiled("generate_html")
+    def generate_html(self, category, current_page=0, page_urls=None) -> str:
+        return self.render_blog(category, self.get_sorted_pages(category),
+                                ("blog", category, current_page),
+                                current_page=current_page, page_urls=page_urls)
+
+    def render_blog(self, category, records, key, **overrides) -> str:
+        """Render records with the template of a category, and the variables in `overrides`."""
         template = self.jinja_templates[category]
+        variables = self.get_template_variables(category, records)
+        variables.update(overrides)
 
-        blog_pages = sorted(self.pages[category]["pages"],
-                            key=lambda page: page.meta["git-timestamp"],
-                            reverse=config.sort["from"] == "new"
-                            )
+        signed = records
+        if variables["page_urls"]:
+            # Only the current page is rendered, along with the number of pages
+            size, current = variables["page_size"], variables["current_page"]
+            signed = records[current * size:(current + 1) * size] if size > 0 else records
+        signature = (len(records),) + self.get_signature([(None, signed)]) + \
+            tuple((name, tuple(value) if isinstance(value, list) else value)
+                  for name, value in overrides.items())
+        return self.render_cached(key, signature, lambda: template.render(**variables))
 
+    def get_template_variables(self, category, records) -> dict:
+        config = self.categories[category]
         theme_options = config.theme.get("options") if config.theme else []
 
-        return template.render(
-            pages=blog_pages, page_size=config.size,
+        return dict(
+            current_page=0, page_urls=None,
+            pages=records, page_size=config.size,
             paging=config.paging, is_revision=config.sort["by"] == "revision",
             show_total=config.show_total, theme_options=theme_options,
             index_url=self.tags_index_url, show_tags="tags" in self.features,
+            tag_url=self.get_tag_url,
             mkdocs_context=self.mkdocs_template_context,
             full_content=config.full_content,
+            lazy_media="lazy_media" in self.features,
+            stylesheet=self.stylesheets.get(category),
         )
 
-    def with_timestamp(self, page, by_revision):
-        timestamp = None
-        if "time" in page.meta:
-            timestamp = self._parse_time(page.meta["time"])
-        if "date" in page.meta and timestamp is None:
-            timestamp = self._parse_time(page.meta["date"])
-        if not timestamp:
-            timestamp = self.util.get_git_commit_timestamp(
-                page.file.abs_src_path, is_first_commit=(not by_revision))
-        page.meta["git-timestamp"] = timestamp
-        page.meta["localized-time"] = self.util.get_localized_date(
-            timestamp, False, format=self.time_format, _locale=self.locale)
+    def setup_assets(self):
+        """
+        Move the styles of the templates and the script of the pagination to
+        files named by their content, to be linked instead of inlined.
+        """
+        directory = self.features["assets"].get("dir", "assets/blogging").strip("/")
+
+        def add_asset(name, content) -> str:
+            path = posixpath.join(directory, get_asset_name(name, content))
+            self.assets[path] = content
+            return (self.site_url or "/") + path
+
+        def get_styles(html) -> str:
+            blocks = []
+            for match in STYLE_PATTERN.finditer(html):
+                block = match.group(1).strip()
+                if block not in blocks:
+                    blocks.append(block)
+            return "\n\n".join(blocks) + "\n"
+
+        # Styles of each template, which can differ by theme
+        for name, template in self.jinja_templates.items():
+            html = template.render(**self.get_template_variables(name, []))
+            self.stylesheets[name] = add_asset("blogging.css", get_styles(html))
+
+        self.tags_stylesheet = add_asset("blogging-tags.css", get_styles(
+            self.tags_template.render(tags=[], index_url=self.tags_index_url)))
+        self.script_url = add_asset("pagination.js", get_script_source())
+
+    def get_scripts_html(self) -> str:
+        if self.script_url:
+            return f'<script src="{self.script_url}"></script>'
+        return get_scripts()
+
+    def get_recent_pages(self) -> Dict[str, List[PostRecord]]:
+        """Get the newest pages of each category, shared by all pages of the site."""
+        if self.recent_pages is None:
+            options = self.features["recent"]
+            count = options.get("count", 5)
+            self.recent_pages = {
+                name: heapq.nlargest(count, self.pages[name]["pages"],
+                                     key=lambda record: record.timestamp)
+                if name in self.pages else []
+                for name in options.get("categories") or self.categories
+            }
+        return self.recent_pages
+
+    def get_sorted_pages(self, category) -> list:
+        if "sorted" not in self.pages[category]:
+            self.pages[category]["sorted"] = sorted(
+                self.pages[category]["pages"],
+                key=lambda record: record.timestamp,
+                reverse=self.categories[category].sort["from"] == "new"
+            )
+        return self.pages[category]["sorted"]
+
+    @profiled("write_feeds")
+    def write_feeds(self, config):
+        """Write the feeds of the categories, newest entries first."""
+        from .feeds import FORMATS, WRITERS
+
+        if not self.site_url:
+            logger.warning("[blogging-plugin] Feeds require 'site_url'. Skipping...")
+            return
+
+        options = self.features["feeds"]
+        formats = options.get("formats", list(FORMATS))
+        limit = options.get("limit", 20)
+        for category in options.get("categories") or self.categories:
+            if category not in self.categories:
+                logger.warning(f"[blogging-plugin] Feed of unknown category '{category}'. Skipping...")
+                continue
+
+            pages = self.get_sorted_pages(category) if category in self.pages else []
+            if self.categories[category].sort["from"] != "new":
+                pages = pages[::-1]
+            if not pages:
+                continue
+
+            feed_dir = posixpath.join(options.get("dir", "feed"), category)
+            feed = {
+                "title": config["site_name"] if category == "global"
+                else f"{config['site_name']} - {category}",
+                "description": config.get("site_description"),
+                "author": config.get("site_author") or config["site_name"],
+                "url": self.blog_urls.get(category, self.site_url),
+                "updated": max(record.updated for record in pages[:limit]),
+            }
+            for name in formats:
+                if name not in WRITERS:
+                    logger.warning(f"[blogging-plugin] Unknown feed format '{name}'. Skipping...")
+                    continue
+                path = posixpath.join(feed_dir, FORMATS[name])
+                feed["feed_url"] = self.site_url + path
+                entries = (self.get_feed_entry(page, options.get("content", False))
+                           for page in itertools.islice(pages, limit))
+
+                path = os.path.join(config["site_dir"], path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as file:
+                    WRITERS[name](file, feed, entries)
+
+    def get_feed_entry(self, record, content) -> dict:
+        from .feeds import absolute_links
+
+        html = (record.excerpt or record.content) if content else None
+        return {
+            "title": record.title,
+            "url": record.canonical_url,
+            "published": record.created,
+            "updated": record.updated,
+            "summary": record.description,
+            # Links relative to the page would be broken in feed readers
+            "content": absolute_links(html, record.canonical_url) if html else None,
+        }
+
+    def render_cached(self, key, signature, render) -> str:
+        """
+        Render with `render`, unless the signature is the same as last build,
+        or a fragment with the same signature is cached on disk.
+        """
+        cached = self.render_cache.get(key)
+        if cached and cached[0] == signature:
+            self.profiler.count("render_cache_hits")
+            if self.fragment_context:
+                self.fragments_used.add(self.get_fragment_name(key, signature))
+            return cached[1]
+
+        self.profiler.count("render_cache_misses")
+        html = None
+        if self.fragment_context:
+            name = self.get_fragment_name(key, signature)
+            self.fragments_used.add(name)
+            html = self.read_fragment(name)
+
+        if html is None:
+            start = time.perf_counter()
+            html = render()
+            self.profiler.add_render(" ".join(str(part) for part in key), time.perf_counter() - start)
+            if self.fragment_context:
+                self.write_fragment(name, html)
+
+        self.render_cache[key] = (signature, html)
+        return html
+
+    def get_fragment_context(self, global_config) -> str:
+        """Hash the inputs of the rendered fragments, other than their pages."""
+        formatter = Util.get_date_formatter(False, self.time_format, self.locale)
+
+        # The whole mkdocs config, including the config of the plugin, `extra`,
+        # the theme and the markdown extensions, which templates can all read
+        digest = hashlib.sha1(repr((
+            FRAGMENT_CACHE_VERSION, get_config_digest(global_config),
+            str(getattr(formatter, "locale", None)), time.timezone, time.tzname,
+        )).encode("utf-8"))
+
+        # Sources of all templates, which can include each other
+        for search_path in self.jinja_env.loader.searchpath:
+            for name in sorted(os.listdir(search_path)):
+                if name.endswith(".html"):
+                    with open(os.path.join(search_path, name), "rb") as file:
+                        digest.update(name.encode("utf-8"))
+                        digest.update(file.read())
+
+        return digest.hexdigest()
+
+    def get_fragment_name(self, key, signature) -> str:
+        return hashlib.sha1(
+            repr((self.fragment_context, key, signature)).encode("utf-8")
+        ).hexdigest() + ".html"
+
+    def read_fragment(self, name):
+        path = os.path.join(self.util.cache_dir, "fragments", name)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                html = file.read()
+        except OSError:
+            self.profiler.count("fragment_cache_misses")
+            return None
+        self.profiler.count("fragment_cache_hits")
+        return html
+
+    def write_fragment(self, name, html):
+        directory = os.path.join(self.util.cache_dir, "fragments")
+        path = os.path.join(directory, name)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as file:
+                file.write(html)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            logger.warning(f"[blogging-plugin] Unable to write rendered fragment '{path}'.")
+
+    def prune_fragments(self):
+        """Remove the fragments on disk that are not used by current build."""
+        directory = os.path.join(self.util.cache_dir, "fragments")
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            if name not in self.fragments_used:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def get_signature(self, groups) -> tuple:
+        """
+        Identify the content of grouped records by what they show, as the html
+        can change without the source, e.g. with snippets or macros.
+        """
+        return tuple(
+            (name, tuple((record.src_path, record.digest(),
+                          # Links to the tags, which can move to another page
+                          tuple(map(self.get_tag_path, record.tags)) if self.tag_pages else None)
+                         for record in records))
+            for name, records in groups
+        )
+
+    def get_categories(self, src_path):
+        """Get the names of the categories including the given page."""
+        return self.category_trie.find(src_path)
+
+    def get_cached_times(self, page) -> PageTimes:
+        """Same as `get_times`, reusing the result if the page is unchanged."""
+        key = page.file.src_path
+        digest = self.page_hashes.get(key)
+        cached = self.timestamps.get(key)
+        if cached and cached[0] == digest:
+            self.profiler.count("page_timestamp_hits")
+            return cached[1]
+
+        self.profiler.count("page_timestamp_misses")
+        times = self.get_times(page)
+        self.timestamps[key] = (digest, times)
+        return times
+
+    def get_times(self, page) -> PageTimes:
+        """Resolve the creation and revision time of a page with one lookup."""
+        timestamp = self.get_meta_time(page.meta)
+        if timestamp:
+            created = updated = timestamp
+        else:
+            created, updated = self.util.get_git_commit_timestamps(page.file.abs_src_path)
+
+        formatter = Util.get_date_formatter(False, self.time_format, self.locale)
+        return PageTimes(created, updated, formatter.format(created), formatter.format(updated))
+
+    def with_timestamp(self, page, by_revision, times: PageTimes = None):
+        """Set the creation or revision time of a page in its meta."""
+        if times is None:
+            times = self.get_times(page)
+        page.meta["git-timestamp"] = times.updated if by_revision else times.created
+        page.meta["localized-time"] = times.localized_updated if by_revision else times.localized_created
 
         return page
 
+    def get_meta_time(self, meta):
+        timestamp = None
+        if "time" in meta:
+            timestamp = self._parse_time(meta["time"])
+        if "date" in meta and timestamp is None:
+            timestamp = self._parse_time(meta["date"])
+        return timestamp
+
     def _parse_time(self, value):
         if isinstance(value, datetime):
             return value.timestamp()
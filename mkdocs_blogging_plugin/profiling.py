@@ -0,0 +1,80 @@
+"""Optional instrumentation of the time spent by the plugin."""
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import wraps
+
+
+def profiled(name):
+    """Record the time of a method in the `profiler` of its instance."""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.profiler.add_time(name, time.perf_counter() - start,
+                                       page=kwargs.get("page"))
+        return wrapper
+    return decorator
+
+
+class Profiler:
+    """Collector of timings and counters of a single build.
+
+    Nothing is recorded unless `enabled` is set.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.start = time.perf_counter()
+        # [calls, seconds] by name
+        self.timings = defaultdict(lambda: [0, 0.0])
+        # Seconds by source path of the page
+        self.pages = defaultdict(float)
+        # Seconds by rendered blog or tags index
+        self.renders = {}
+        self.counters = Counter()
+
+    def add_time(self, name: str, seconds: float, page=None):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.timings[name][0] += 1
+            self.timings[name][1] += seconds
+            if page is not None and hasattr(page, "file"):
+                self.pages[page.file.src_path] += seconds
+
+    def add_render(self, key: str, seconds: float):
+        if self.enabled:
+            self.renders[key] = self.renders.get(key, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] += value
+
+    def report(self, slowest: int = 10) -> dict:
+        slowest_pages = sorted(self.pages.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "total": time.perf_counter() - self.start,
+            "timings": {name: {"calls": calls, "time": seconds}
+                        for name, (calls, seconds) in self.timings.items()},
+            "counters": dict(self.counters),
+            "renders": self.renders,
+            "slowest_pages": [{"page": path, "time": seconds}
+                              for path, seconds in slowest_pages[:slowest]],
+        }
+
+    def write(self, path: str, slowest: int = 10) -> dict:
+        report = self.report(slowest)
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+        return report
@@ -0,0 +1,67 @@
+"""Compact records of the pages shown in blogs and tags."""
+import hashlib
+from typing import List, NamedTuple
+
+from .media import defer_media
+
+
+class PageTimes(NamedTuple):
+    """Creation and revision time of a page, resolved together."""
+    created: float
+    updated: float
+    localized_created: str
+    localized_updated: str
+
+
+class PostRecord:
+    """What the templates need to show a page, without the page itself.
+
+    Unlike mkdocs' `Page`, a record keeps the content only when it is
+    shown, so that pages can be held in several blogs and tags at once.
+    `meta` is the meta section of the page, for custom templates.
+    `timestamp` is the time the blog is sorted by, either `created`
+    or `updated`.
+    """
+
+    __slots__ = ("src_path", "title", "canonical_url", "url", "meta", "timestamp",
+                 "localized_time", "created", "updated", "localized_created",
+                 "localized_updated", "tags", "description", "excerpt", "content", "deferred",
+                 "hash")
+
+    def __init__(self, page, times: PageTimes, by_revision: bool = False, content: str = None):
+        meta = page.meta
+        self.src_path: str = page.file.src_path
+        self.title: str = page.title
+        self.canonical_url: str = page.canonical_url
+        self.url: str = page.url
+        self.meta: dict = meta
+        self.created, self.updated = times.created, times.updated
+        self.localized_created, self.localized_updated = times.localized_created, times.localized_updated
+        self.timestamp = times.updated if by_revision else times.created
+        self.localized_time = times.localized_updated if by_revision else times.localized_created
+        tags = meta.get("tags")
+        self.tags: List[str] = tags if isinstance(tags, list) else []
+        self.description: str = meta.get("description")
+        self.excerpt: str = meta.get("content-excerpt")
+        self.content = content
+        self.deferred: str = None
+        self.hash: str = None
+
+    def deferred_html(self) -> str:
+        """The excerpt or content shown in the blog, with the media deferred."""
+        if self.deferred is None:
+            self.deferred = defer_media(self.excerpt or self.content or "")
+        return self.deferred
+
+    def digest(self) -> str:
+        """Hash of everything the templates can show, which tells when a rendered blog is stale."""
+        if self.hash is None:
+            self.hash = hashlib.sha1(repr((
+                self.title, self.canonical_url, self.url, self.meta, self.tags,
+                self.description, self.excerpt, self.content, self.timestamp,
+                self.localized_time, self.localized_created, self.localized_updated,
+            )).encode("utf-8")).hexdigest()
+        return self.hash
+
+    def __repr__(self):
+        return f"PostRecord(src_path={self.src_path!r}, title={self.title!r})"
@@ -0,0 +1,62 @@
+"""Removal of the generated blog pages from the search index."""
+import json
+import logging
+from typing import Dict
+
+logger = logging.getLogger("mkdocs.plugins")
+
+# Ways to index a page with a blog or tags
+INDEX_TITLES = "titles"
+INDEX_NONE = "none"
+
+
+def filter_search_index(data: dict, urls: Dict[str, str]) -> int:
+    """
+    Remove the text of pages from a search index of mkdocs or mkdocs-material.
+
+    Args:
+        data (dict): The search index, with a `docs` list of entries.
+        urls (dict): How to index each page (`titles` or `none`), by its url.
+
+    Returns:
+        int: number of entries removed or emptied.
+    """
+    docs = []
+    changed = 0
+    for entry in data["docs"]:
+        url, _, anchor = entry["location"].partition("#")
+        mode = urls.get(url)
+        if mode is None:
+            docs.append(entry)
+            continue
+
+        changed += 1
+        # Keep the entry of the page itself, without its text
+        if mode == INDEX_TITLES and not anchor:
+            docs.append(dict(entry, text=""))
+
+    data["docs"] = docs
+    return changed
+
+
+def filter_search_index_file(path: str, urls: Dict[str, str]):
+    """Same as `filter_search_index`, for the `search_index.json` written by the search plugin."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError):
+        logger.warning(f"[blogging-plugin] Unable to read search index '{path}'. Ignoring...")
+        return
+
+    if "index" in data:
+        # A prebuilt index would still find the removed entries
+        logger.warning(
+            "[blogging-plugin] Unable to remove blog pages from a prebuilt search index. Ignoring..."
+        )
+        return
+
+    if filter_search_index(data, urls):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, sort_keys=True, separators=(",", ":"), default=str)
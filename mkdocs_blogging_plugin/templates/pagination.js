@@ -14,7 +14,23 @@ function scrollToTop() {
   }, 100);
 }
 
-const onButtonClick = (ele) => {
+// Load the media deferred until their page is shown
+const loadMedia = (page) => {
+  var media = page.querySelectorAll("[data-blogging-deferred]");
+  for (var k = 0; k < media.length; k++) {
+    ["src", "srcset", "poster"].forEach(function (name) {
+      const value = media[k].getAttribute("data-" + name)
+      if (value !== null) {
+        media[k].setAttribute(name, value)
+        media[k].removeAttribute("data-" + name)
+      }
+    });
+    media[k].removeAttribute("data-blogging-deferred")
+  }
+}
+
+// Show the page of a link, in the blog containing the pagination
+const onButtonClick = (container, pagination, ele) => {
   var current = pagination.getElementsByClassName("active");
   if (current.length) {
     current[0].className = current[0].className.replace(
@@ -25,7 +41,7 @@ const onButtonClick = (ele) => {
 
   // Togglg visibility of pages
   const destPage = parseInt(ele.textContent)
-  var pages = document.getElementsByClassName("page")
+  var pages = container.getElementsByClassName("page")
   if (destPage && pages.length) {
     for (var j = 0; j < pages.length; j++) {
       const pageId = parseInt(pages[j].id.replace("page", ""))
@@ -37,23 +53,41 @@ const onButtonClick = (ele) => {
       } else {
         // This is the destination page
         pages[j].className = pages[j].className.replace(" blog-hidden", "")
+        loadMedia(pages[j])
       }
     }
     scrollToTop();
   }
 };
 
-var pagination = document.getElementById("blog-pagination");
-if (pagination) {
+const setUpPagination = (container, pagination) => {
   var links = pagination.getElementsByClassName("page-number");
   if (links.length) {
     for (var i = 0; i < links.length; i++) {
       // Toggle pagination highlight
       links[i].addEventListener("click", function () {
-        onButtonClick(this);
+        onButtonClick(container, pagination, this);
       });
     }
-    links[currentPage].className += " active"
-    onButtonClick(links[currentPage]);
+    const link = links[Math.min(currentPage, links.length - 1)]
+    link.className += " active"
+    onButtonClick(container, pagination, link);
+  }
+}
+
+// Blogs paged by this script, leaving alone those with a page per file
+var containers = document.getElementsByClassName("blog-paged");
+for (var c = 0; c < containers.length; c++) {
+  const pagination = containers[c].querySelector(".blog-pagination")
+  if (pagination) {
+    setUpPagination(containers[c], pagination)
+  }
+}
+
+// Custom templates without the container
+if (!containers.length) {
+  var pagination = document.getElementById("blog-pagination");
+  if (pagination) {
+    setUpPagination(document, pagination)
   }
 }
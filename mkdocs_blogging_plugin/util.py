@@ -25,25 +25,30 @@ SOFTWARE.
 """
 
 """Utility class for mkdocs plugin."""
+import json
 import logging
 import os
+import threading
 import time
-from git import (
-    Git,
-    Repo,
-    GitCommandError,
-    GitCommandNotFound,
-    InvalidGitRepositoryError,
-    NoSuchPathError,
-)
-
-from babel.dates import format_date, format_datetime
 import locale, sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Tuple
+
+# GitPython and Babel are imported on first use, as neither is
+# needed by sites with dates in the meta sections of all pages.
+if TYPE_CHECKING:
+    from git import Repo
+
+from .history import HistoryIndex
+from .profiling import Profiler, profiled
 
 logger = logging.getLogger("mkdocs.plugins")
 
+CACHE_FILE = "timestamps.json"
+MANIFEST_VERSION = 1
+
 class Util:
     """Utility class.
 
@@ -53,104 +58,419 @@ class Util:
     def __init__(self):
         """Initialize utility class."""
         self.repo_cache = {}
+        self.history_cache = {}
+        # HEAD each history index was built at, kept even if building it failed
+        self.history_heads: Dict[str, str] = {}
+        # Directory of the on-disk timestamp cache, disabled if not set
+        self.cache_dir: str = None
+        self.cache: dict = None
+        # (creation, revision) timestamps read from a manifest, by path
+        # relative to `manifest_root`, used instead of git if set
+        self.manifest: Dict[str, List[int]] = None
+        self.manifest_root: str = None
+        # Paths whose timestamps fell back to the build time
+        self.fallback_paths: Set[str] = set()
+        self.lock = threading.Lock()
+        self.profiler = Profiler()
+
+    def _get_repo(self, path: str) -> "Repo":
+        from git import Repo
 
-    def _get_repo(self, path: str) -> Git:
         if not os.path.isdir(path):
             path = os.path.dirname(path)
 
         if path not in self.repo_cache:
-            self.repo_cache[path] = Repo(path, search_parent_directories=True).git
+            with self.lock:
+                if path not in self.repo_cache:
+                    self.repo_cache[path] = Repo(path, search_parent_directories=True)
 
         return self.repo_cache[path]
 
+    def _get_history(self, repo: "Repo") -> HistoryIndex:
+        """Get the history index of a repository, walking its log on first use."""
+        from git import GitCommandError
+
+        root = os.path.realpath(repo.working_tree_dir)
+        if root not in self.history_cache:
+            with self.lock:
+                if root not in self.history_cache:
+                    try:
+                        self.history_cache[root] = self._build_history(repo, root)
+                    except GitCommandError:
+                        # Fall back to querying the files one by one
+                        self.history_cache[root] = None
+
+        return self.history_cache[root]
+
+    def refresh(self) -> bool:
+        """
+        Drop the resolved timestamps if any known repository has new commits,
+        e.g. between rebuilds of `mkdocs serve`.
+
+        Returns:
+            bool: whether the timestamps have been dropped.
+        """
+        if not self.history_cache:
+            return False
+
+        from git import GitCommandError, InvalidGitRepositoryError, NoSuchPathError, Repo
+
+        changed = False
+        for root in list(self.history_cache):
+            try:
+                self.profiler.count("git_subprocesses")
+                head = Repo(root).git.rev_parse("HEAD")
+            except (GitCommandError, InvalidGitRepositoryError, NoSuchPathError):
+                head = None
+            # A repository without an index, e.g. without commits, is only
+            # tried again once its HEAD moves
+            if head != self.history_heads.get(root):
+                # The index is updated from the in-memory cache on next use
+                del self.history_cache[root]
+                changed = True
+
+        if changed:
+            Util.get_git_commit_timestamps.cache_clear()
+
+        return changed
+
+    def _build_history(self, repo: "Repo", root: str) -> HistoryIndex:
+        from git import GitCommandError
+
+        git = repo.git
+        self.history_heads.pop(root, None)
+        self.profiler.count("git_subprocesses")
+        head = git.rev_parse("HEAD")
+        self.history_heads[root] = head
+        key = self._get_cache_key(root)
+        index = None
+
+        # Only scan the commits made after the cached one
+        if key in self._load_cache():
+            index = HistoryIndex.from_dict(self.cache[key])
+            if index.head != head:
+                try:
+                    self.profiler.count("git_subprocesses", 2)
+                    git.merge_base(index.head, head, is_ancestor=True)
+                    index.update(git, f"{index.head}..{head}")
+                except GitCommandError:
+                    # History has been rewritten
+                    index = None
+
+        if index is None:
+            index = HistoryIndex()
+            self.profiler.count("git_subprocesses")
+            index.update(git, head)
+
+        if index.head != head:
+            index.head = head
+            self.cache[key] = index.to_dict()
+            self._save_cache()
+
+        return index
+
+    def _get_cache_key(self, root: str) -> str:
+        # Relative to the cache directory, so that the cache stays valid
+        # when the project is checked out elsewhere, e.g. in CI
+        if self.cache_dir:
+            root = os.path.relpath(root, self.cache_dir)
+        return root.replace(os.sep, "/")
+
+    def _load_cache(self) -> dict:
+        if self.cache is None:
+            self.cache = {}
+            if self.cache_dir:
+                path = os.path.join(self.cache_dir, CACHE_FILE)
+                try:
+                    with open(path, "r") as file:
+                        self.cache = json.load(file)
+                except FileNotFoundError:
+                    pass
+                except (OSError, ValueError):
+                    logger.warning(
+                        "[blogging-plugin] Unable to read timestamp cache '%s'. Ignoring..."
+                        % path
+                    )
+
+        return self.cache
+
+    def _save_cache(self):
+        if not self.cache_dir:
+            return
+
+        path = os.path.join(self.cache_dir, CACHE_FILE)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + ".tmp", "w") as file:
+                json.dump(self.cache, file, separators=(",", ":"))
+            os.replace(path + ".tmp", path)
+        except OSError:
+            logger.warning(
+                "[blogging-plugin] Unable to write timestamp cache '%s'." % path
+            )
+
+    def load_manifest(self, path: str, root: str):
+        """
+        Read the timestamps of the files from a manifest written by `write_manifest`.
+
+        Args:
+            path (str): Path of the manifest, or None to stop using it.
+            root (str): Directory the paths in the manifest are relative to.
+        """
+        manifest = None
+        if path:
+            try:
+                with open(path, "r") as file:
+                    data = json.load(file)
+                if data.get("version") != MANIFEST_VERSION:
+                    raise ValueError
+                manifest = data["pages"]
+            except FileNotFoundError:
+                logger.warning(
+                    "[blogging-plugin] Timestamp manifest '%s' not found. Falling back to git logs."
+                    % path
+                )
+            except (OSError, ValueError, KeyError):
+                logger.warning(
+                    "[blogging-plugin] Unable to read timestamp manifest '%s'. Ignoring..."
+                    % path
+                )
+
+        if manifest != self.manifest:
+            Util.get_git_commit_timestamps.cache_clear()
+        self.manifest = manifest
+        self.manifest_root = os.path.realpath(root) if root else None
+
+    def write_manifest(self, path: str, root: str, files: Iterable[str]) -> int:
+        """
+        Write the creation and revision timestamps of files from git logs,
+        one file per line, so that the manifest can be committed. Files
+        without commits, e.g. untracked ones, are left out.
+
+        Args:
+            path (str): Path of the manifest.
+            root (str): Directory the files are relative to.
+            files (list): Paths of the files, relative to `root`.
+
+        Returns:
+            int: number of files written.
+        """
+        lines = []
+        for name in sorted(set(f.replace(os.sep, "/") for f in files)):
+            abs_path = os.path.join(root, name)
+            timestamps = list(self.get_git_commit_timestamps(abs_path))
+            if abs_path in self.fallback_paths:
+                # The build time, to be read from git again once committed
+                continue
+            lines.append(f"{json.dumps(name)}: {json.dumps(timestamps)}")
+
+        with open(path, "w") as file:
+            file.write('{"version": %d, "pages": {\n' % MANIFEST_VERSION)
+            file.write(",\n".join(lines))
+            file.write("\n}}\n")
+
+        return len(lines)
+
+    def _get_manifest_name(self, path: str) -> str:
+        return os.path.relpath(os.path.realpath(path), self.manifest_root).replace(os.sep, "/")
+
+    def _get_manifest_timestamps(self, path: str):
+        timestamps = self.manifest.get(self._get_manifest_name(path))
+        self.profiler.count("manifest_hits" if timestamps else "manifest_misses")
+        return timestamps
 
-    @lru_cache(maxsize=None)
     def get_git_commit_timestamp(
             self,
             path: str,
             is_first_commit: bool = False
     ) -> int:
         """
-        Get a list of commit dates in unix timestamp, starts with the most recent commit.
+        Get the timestamp of the first or the most recent commit of a file.
 
         Args:
+            path (str): Location of a markdown file that is part of a Git repository.
             is_first_commit (bool): if true, get the timestamp of the first commit,
                                     else, get that of the most recent commit.
+
+        Returns:
+            int: commit date in unix timestamp.
+        """
+        return self.get_git_commit_timestamps(path)[0 if is_first_commit else 1]
+
+    @lru_cache(maxsize=None)
+    @profiled("get_git_commit_timestamps")
+    def get_git_commit_timestamps(self, path: str) -> Tuple[int, int]:
+        """
+        Get the timestamps of the first and the most recent commit of a file at once.
+
+        Args:
             path (str): Location of a markdown file that is part of a Git repository.
-            is_first_commit (bool): retrieve commit timestamp when file was created.
 
         Returns:
-            int: commit date in unix timestamp, starts with the most recent commit.
+            tuple: (first commit, most recent commit) in unix timestamp.
         """
-        commit_timestamp = ""
+        commit_timestamps = []
+        self.fallback_paths.discard(path)
+
+        if self.manifest is not None:
+            timestamps = self._get_manifest_timestamps(path)
+            if timestamps:
+                return int(timestamps[0]), int(timestamps[1])
+
+        from git import (GitCommandError, GitCommandNotFound, InvalidGitRepositoryError,
+                         NoSuchPathError)
 
         # perform git log operation
         try:
             # Retrieve author date in UNIX format (%at)
             # https://git-scm.com/docs/git-log#Documentation/git-log.txt-ematem
-            # https://git-scm.com/docs/git-log#Documentation/git-log.txt---diff-filterACDMRTUXB82308203
             realpath = os.path.realpath(path)
-            git = self._get_repo(realpath)
-            if is_first_commit:
-                # diff_filter="A" will select the commit that created the file
-                commit_timestamp = git.log(
-                    realpath, date="short", format="%at", diff_filter="A", follow=True
-                )
-                # A file can be created multiple times, through a file renamed. 
-                # Commits are ordered with most recent commit first
-                # Get the oldest commit only
-                if commit_timestamp != "":
-                    commit_timestamp = commit_timestamp.split()[-1]
+            repo = self._get_repo(realpath)
+            git = repo.git
+            history = self._get_history(repo) if repo.working_tree_dir else None
+            if history is not None:
+                relpath = os.path.relpath(
+                    realpath, os.path.realpath(repo.working_tree_dir))
+                timestamps = history.get(relpath.replace(os.sep, "/"))
+                self.profiler.count("history_index_hits" if timestamps else "history_index_misses")
+                if timestamps:
+                    commit_timestamps = list(timestamps)
             else:
-                commit_timestamp = git.log(
-                    realpath, date="short", format="%at", n=1, follow=True
-                )
+                # Commits are ordered with most recent commit first, and the
+                # oldest one, across renames, is the commit that created the file
+                self.profiler.count("git_subprocesses")
+                commits = git.log(realpath, format="%at", follow=True).split()
+                if commits:
+                    commit_timestamps = [commits[-1], commits[0]]
         except (InvalidGitRepositoryError, NoSuchPathError) as err:
             logger.warning(
                 "[blogging-plugin] Unable to find a git directory and/or git is not installed."
                 " Falling back to build date."
             )
-            commit_timestamp = time.time()
+            commit_timestamps = [time.time()] * 2
+            self.fallback_paths.add(path)
         except GitCommandError as err:
             logger.warning(
                 "[blogging-plugin] Unable to read git logs of '%s'. Is git log readable?"
                 " Falling back to build date."
                 % path
             )
-            commit_timestamp = time.time()
+            commit_timestamps = [time.time()] * 2
+            self.fallback_paths.add(path)
         except GitCommandNotFound as err:
             logger.warning(
                 "[blogging-plugin] Unable to perform command: 'git log'. Is git installed?"
                 " Falling back to build date."
             )
-            commit_timestamp = time.time()
+            commit_timestamps = [time.time()] * 2
+            self.fallback_paths.add(path)
 
         # create timestamp
-        if commit_timestamp == "":
-            commit_timestamp = time.time()
+        if not commit_timestamps:
+            commit_timestamps = [time.time()] * 2
+            self.fallback_paths.add(path)
             logger.warning(
                 "[blogging-plugin] '%s' has no git logs, using current timestamp"
                 % path
             )
 
-        return int(commit_timestamp)
+        return int(commit_timestamps[0]), int(commit_timestamps[1])
+
+    def prefetch_git_commit_timestamps(
+            self,
+            paths: Iterable[str],
+            max_workers: int = None
+    ):
+        """
+        Resolve the timestamps of many files, so that later calls to
+        `get_git_commit_timestamps` are served from the cache.
+
+        Files in a repository with a history index are looked up at once.
+        Only the others, each costing a `git log`, are queried concurrently.
+        Files outside any repository are left to `get_git_commit_timestamps`.
+
+        Args:
+            paths (list): Locations of the files, see `get_git_commit_timestamps`.
+            max_workers (int): Maximum number of concurrent git subprocesses.
+        """
+        from git import InvalidGitRepositoryError, NoSuchPathError
+
+        pending = []
+        for path in sorted(set(paths)):
+            if self.manifest is not None and self._get_manifest_name(path) in self.manifest:
+                continue
+            try:
+                repo = self._get_repo(os.path.realpath(path))
+            except (InvalidGitRepositoryError, NoSuchPathError):
+                logger.debug(f"[blogging-plugin] No git repository found for '{path}'. Skipping prefetch...")
+                continue
+
+            if repo.working_tree_dir and self._get_history(repo) is not None:
+                self.get_git_commit_timestamps(path)
+            else:
+                pending.append(path)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for _ in executor.map(self.get_git_commit_timestamps, pending):
+                    pass
 
     @staticmethod
     def get_localized_date(timestamp: float, day_only: bool, format: str=None, _locale: str=None) -> str:
-        time = datetime.fromtimestamp(timestamp)
+        return Util.get_date_formatter(day_only, format, _locale).format(timestamp)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_date_formatter(day_only: bool, format: str=None, _locale: str=None) -> "DateFormatter":
+        """Get the formatter shared by all dates with the same settings."""
+        return DateFormatter(day_only, format, _locale)
+
+
+class DateFormatter:
+    """Formatter of localized dates.
+
+    The locale and its date patterns are parsed once, instead of on
+    every call of `format_date`/`format_datetime`.
+    """
+
+    def __init__(self, day_only: bool, format: str=None, _locale: str=None):
+        self.day_only = day_only
+        self.time_format = format
         if format:
-            return datetime.strftime(time, format)
-        else:
-            if not _locale:
-                if sys.version_info[:2] < (3, 11):
-                    _locale = locale.getdefaultlocale()[0]
-                else:
-                    _locale = locale.getlocale()[0]
-                # Fallback to en_US if locale environment is not set
-                if not _locale:
-                    _locale = "en_US"
-
-            if day_only:
-                return format_date(time.date(), format="short", locale=_locale)
+            return
+
+        if not _locale:
+            if sys.version_info[:2] < (3, 11):
+                _locale = locale.getdefaultlocale()[0]
             else:
-                return format_datetime(time, format="short", locale=_locale)
+                _locale = locale.getlocale()[0]
+            # Fallback to en_US if locale environment is not set
+            if not _locale:
+                _locale = "en_US"
+
+        from babel import Locale
+        from babel.dates import (get_date_format, get_datetime_format, get_time_format,
+                                 parse_pattern)
+
+        # Same as `format_date` and `format_datetime` with format="short"
+        self.locale = Locale.parse(_locale)
+        self.date_pattern = parse_pattern(get_date_format("short", locale=self.locale))
+        self.time_pattern = parse_pattern(get_time_format("short", locale=self.locale))
+        self.datetime_format = get_datetime_format("short", locale=self.locale).replace("'", "")
+        self.month_pattern = parse_pattern(self.locale.datetime_skeletons.get("yMMMM", "LLLL y"))
+
+    def format(self, timestamp: float) -> str:
+        time = datetime.fromtimestamp(timestamp)
+        if self.time_format:
+            return datetime.strftime(time, self.time_format)
+        if self.day_only:
+            return self.date_pattern.apply(time.date(), self.locale)
+        return self.datetime_format \
+            .replace("{0}", self.time_pattern.apply(time.time(), self.locale)) \
+            .replace("{1}", self.date_pattern.apply(time.date(), self.locale))
+
+    def format_month(self, year: int, month: int) -> str:
+        """Format a month of a year, e.g. in an archive."""
+        if self.time_format:
+            return date(year, month, 1).strftime("%B %Y")
+        return self.month_pattern.apply(date(year, month, 1), self.locale)
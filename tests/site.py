@@ -0,0 +1,62 @@
+import os
+import tempfile
+
+import yaml
+from mkdocs.commands.build import build
+from mkdocs.config import load_config
+
+
+class Site:
+    """A small site built with the plugin in a temporary directory."""
+    def __init__(self, plugin_config: dict, docs: dict, **config):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        config = dict({
+            "site_name": "Test",
+            "site_url": "https://example.com/",
+            "plugins": [{"blogging": plugin_config}],
+            # Keep the titles of the posts out of the navigation
+            "nav": ["index.md"],
+        }, **config)
+        self.config = config
+        self.write_config(config)
+        self.write_docs(docs)
+
+    def path(self, *names) -> str:
+        return os.path.join(self.root, *names)
+
+    def write_docs(self, docs: dict):
+        """Write the pages, by their path relative to the docs directory."""
+        for name, content in docs.items():
+            self.write(os.path.join("docs", name), content)
+
+    def write(self, name, content):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(content)
+
+    def write_config(self, config: dict):
+        with open(self.path("mkdocs.yml"), "w") as file:
+            yaml.safe_dump(config, file)
+
+    def load_config(self):
+        return load_config(config_file=self.path("mkdocs.yml"))
+
+    def build(self, config=None):
+        """Build the site, with a loaded config to keep its plugins across builds."""
+        build(config or self.load_config())
+
+    def read(self, *names) -> str:
+        with open(self.path("site", *names), encoding="utf-8") as file:
+            return file.read()
+
+    def cleanup(self):
+        self.tmp.cleanup()
+
+
+def post(title, date, tags=None, body="") -> str:
+    meta = {"title": title, "date": date}
+    if tags:
+        meta["tags"] = tags
+    return f"---\n{yaml.safe_dump(meta)}---\n\n{body or title}\n"
@@ -0,0 +1,66 @@
+import datetime
+import os
+import re
+import unittest
+
+from .site import Site, post
+
+DATES = [(2022, 12, 5), (2023, 1, 2), (2023, 1, 20), (2023, 3, 1)]
+
+
+class TestArchive(unittest.TestCase):
+    """Test the archive overview and the pages of its months."""
+    @classmethod
+    def setUpClass(cls):
+        docs = {
+            "index.md": "# Home\n",
+            "archive.md": "# Archive\n\n{{ blog_archive }}\n\n{{ blog_archive news }}\n",
+            "news/news.md": post("News", datetime.date(2023, 1, 4)),
+        }
+        for year, month, day in DATES:
+            docs[f"blog/{year}-{month}-{day}.md"] = post(f"Post {year}-{month}-{day}",
+                                                          datetime.date(year, month, day))
+
+        cls.site = Site({"dirs": ["blog"], "categories": [{"name": "news", "dirs": ["news"]}]}, docs)
+        cls.site.build()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.site.cleanup()
+
+    def get_titles(self, *names) -> list:
+        return re.findall(r"(?:Post [\d-]+|News)(?=<)", self.site.read("archive", *names))
+
+    def test_files(self):
+        assert sorted(os.listdir(self.site.path("site", "archive"))) == [
+            "archive-2022-12.html", "archive-2023-01.html", "archive-2023-03.html",
+            "archive-news-2023-01.html", "index.html",
+        ]
+
+    def test_overview(self):
+        html = self.site.read("archive", "index.html")
+        # Newest months first, with the number of articles, and no articles at all
+        months = re.findall(r'<a href="https://example.com/archive/(archive-[\w-]+\.html)">([\w ]+)</a>'
+                            r'\s*&nbsp;&nbsp;\s*<span[^>]*>\s*(\d+)', html)
+        assert months == [
+            ("archive-2023-03.html", "March 2023", "1"),
+            ("archive-2023-01.html", "January 2023", "2"),
+            ("archive-2022-12.html", "December 2022", "1"),
+            ("archive-news-2023-01.html", "January 2023", "1"),
+        ]
+        assert html.index('id="2023"') < html.index('id="2022"')
+        assert not self.get_titles("index.html")
+
+    def test_months(self):
+        html = self.site.read("archive", "archive-2023-01.html")
+        assert "<h2>January 2023</h2>" in html
+        assert self.get_titles("archive-2023-01.html") == ["Post 2023-1-20", "Post 2023-1-2"]
+        # The overview of the other category is kept
+        assert "archive-news-2023-01.html" in html and "archive-2023-03.html" not in html
+
+        assert self.get_titles("archive-news-2023-01.html") == ["News"]
+        assert self.get_titles("archive-2022-12.html") == ["Post 2022-12-5"]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+import unittest
+
+from mkdocs_blogging_plugin.plugin import BloggingPlugin
+
+FILE_PATH = Path(os.path.realpath(__file__))
+
+
+class TestAssets(unittest.TestCase):
+    """Test moving the styles and script to files named by their content."""
+    @classmethod
+    def setUpClass(cls):
+        cls.config = {
+            "features": {
+                "assets": {"dir": "static"},
+            },
+            "categories": [
+                {"name": "c1"},
+                {"name": "c2", "theme": {"name": "card"}},
+            ]
+        }
+
+        global_config = {
+            "site_url": "https://example.com/",
+            "config_file_path": FILE_PATH.as_posix()
+        }
+
+        cls.plugin = BloggingPlugin()
+        cls.plugin.config = cls.config
+        cls.plugin.read_in_config(global_config)
+        cls.plugin.setup_assets()
+
+    def test_names(self):
+        stylesheets = self.plugin.stylesheets
+        # Same templates share a stylesheet
+        assert stylesheets["global"] == stylesheets["c1"]
+        assert stylesheets["global"] != stylesheets["c2"]
+        assert stylesheets["c2"].startswith("https://example.com/static/blogging.")
+        assert self.plugin.script_url.endswith(".js")
+        assert len(self.plugin.assets) == 4
+
+        for path, content in self.plugin.assets.items():
+            assert content.strip()
+            assert "<style" not in content and "</script>" not in content
+
+    def test_render(self):
+        html = self.plugin.render_blog("c2", [], ("test", "c2", 0))
+        assert "<style" not in html
+        assert html.count(f'<link rel="stylesheet" href="{self.plugin.stylesheets["c2"]}">') == 1
+
+        assert self.plugin.get_scripts_html() == f'<script src="{self.plugin.script_url}"></script>'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,6 +33,7 @@ class TestPluginConfig(unittest.TestCase):
                     "by": "creation"
                 },
                 "paging": True,
+                "static_paging": True,
                 "show_total": True,
                 "full_content": False,
             },
@@ -69,6 +70,7 @@ class TestPluginConfig(unittest.TestCase):
             assert category.size == category_dict.get("size", c.size)
             assert category.sort == category_dict.get("sort", c.sort)
             assert category.paging == category_dict.get("paging", c.paging)
+            assert category.static_paging == category_dict.get("static_paging", c.static_paging)
             assert category.show_total == category_dict.get("show_total", c.show_total)
 
 
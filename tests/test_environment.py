@@ -0,0 +1,56 @@
+import datetime
+import os
+import unittest
+
+from .site import Site, post
+
+
+class TestEnvironment(unittest.TestCase):
+    """Test reusing the template environment across rebuilds of `mkdocs serve`."""
+    def setUp(self):
+        self.site = Site({"dirs": ["blog"], "template": "custom.html", "features": {"cache": {}}}, {
+            "index.md": "{{ blog_content }}\n",
+            "blog/post.md": post("Post", datetime.date(2023, 1, 1)),
+        })
+        self.site.write("custom.html", '{% extends "blog.html" %}\n{% block style %}Old{% endblock %}\n')
+
+    def tearDown(self):
+        self.site.cleanup()
+
+    def test_reuse(self):
+        config = self.site.load_config()
+        plugin = config["plugins"]["blogging"]
+        self.site.build(config)
+        env = plugin.jinja_env
+        assert "Old" in self.site.read("index.html")
+        # Compiled templates are saved to the cache directory
+        assert os.listdir(self.site.path(".cache", "blogging", "templates"))
+
+        self.site.build(config)
+        assert plugin.jinja_env is env
+
+        # A modified template is reloaded by the same environment
+        self.site.write("custom.html", '{% extends "blog.html" %}\n{% block style %}New{% endblock %}\n')
+        stat = os.stat(self.site.path("custom.html"))
+        os.utime(self.site.path("custom.html"), (stat.st_atime, stat.st_mtime + 10))
+        self.site.build(config)
+        assert plugin.jinja_env is env
+        assert "New" in self.site.read("index.html")
+
+    def test_search_paths(self):
+        config = self.site.load_config()
+        plugin = config["plugins"]["blogging"]
+        self.site.build(config)
+        env = plugin.jinja_env
+
+        # Another directory of custom templates needs a new environment
+        self.site.write(os.path.join("templates", "custom.html"),
+                        '{% extends "blog.html" %}\n{% block style %}Moved{% endblock %}\n')
+        plugin.config["template"] = "templates/custom.html"
+        self.site.build(config)
+        assert plugin.jinja_env is not env
+        assert "Moved" in self.site.read("index.html")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from mkdocs_blogging_plugin.excerpt import get_excerpt
+
+HTML = """<h1 id="title">Title</h1>
+<p>Hello <strong>brave new</strong> world &amp; more</p>
+<!-- more -->
+<p>Rest</p>
+<ul>
+<li>item</li>
+</ul>"""
+
+
+class TestExcerpt(unittest.TestCase):
+    """Test cutting the content of pages into excerpts."""
+    def test_separator(self):
+        excerpt = get_excerpt(HTML, separator="<!-- more -->")
+        assert excerpt == '<h1 id="title">Title</h1>\n' \
+            '<p>Hello <strong>brave new</strong> world &amp; more</p>\n'
+
+    def test_max_length(self):
+        assert get_excerpt(HTML, max_length=13) == \
+            '<h1 id="title">Title</h1>\n<p>Hello <strong>…</strong></p>'
+        assert get_excerpt(HTML, max_length=22) == \
+            '<h1 id="title">Title</h1>\n<p>Hello <strong>brave new</strong>…</p>'
+        assert get_excerpt(HTML, max_length=1000) is None
+
+    def test_max_blocks(self):
+        assert get_excerpt(HTML, max_blocks=1) == '<h1 id="title">Title</h1>\n'
+        assert get_excerpt(HTML, max_blocks=4) is None
+
+    def test_void_elements(self):
+        assert get_excerpt("<p>a<br>b<img src=x>c d</p>", max_length=4) == \
+            "<p>a<br>b<img src=x>c…</p>"
+
+    def test_no_options(self):
+        assert get_excerpt(HTML) is None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import json
+import unittest
+from types import SimpleNamespace
+from xml.etree import ElementTree
+
+from mkdocs_blogging_plugin.feeds import absolute_links, write_atom, write_json, write_rss
+from mkdocs_blogging_plugin.plugin import BloggingPlugin
+from mkdocs_blogging_plugin.records import PageTimes, PostRecord
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+class TestFeeds(unittest.TestCase):
+    """Test writing feeds from a stream of entries."""
+    @classmethod
+    def setUpClass(cls):
+        cls.feed = {
+            "title": "Blog & news",
+            "url": "https://example.com/blog/",
+            "feed_url": "https://example.com/feed/global/atom.xml",
+            "updated": 1000000000,
+            "author": "Me",
+        }
+        cls.entries = [
+            {"title": f"Post {i}", "url": f"https://example.com/post-{i}/",
+             "published": 1000000000 - i, "updated": 1000000000 + i, "summary": "<Summary>",
+             "content": f"<p>Post {i}</p>" if i else None}
+            for i in range(3)
+        ]
+
+    def write(self, writer) -> bytes:
+        file = io.BytesIO()
+        # Entries are consumed as a stream
+        writer(file, self.feed, iter(self.entries))
+        return file.getvalue()
+
+    def test_atom(self):
+        root = ElementTree.fromstring(self.write(write_atom))
+        assert root.find(f"{ATOM}title").text == "Blog & news"
+        assert root.find(f"{ATOM}updated").text == "2001-09-09T01:46:40+00:00"
+        assert root.find(f"{ATOM}author/{ATOM}name").text == "Me"
+        entries = root.findall(f"{ATOM}entry")
+        assert [entry.find(f"{ATOM}title").text for entry in entries] == ["Post 0", "Post 1", "Post 2"]
+        assert entries[1].find(f"{ATOM}published").text == "2001-09-09T01:46:39+00:00"
+        assert entries[1].find(f"{ATOM}updated").text == "2001-09-09T01:46:41+00:00"
+        assert entries[0].find(f"{ATOM}content") is None
+        assert entries[1].find(f"{ATOM}content").text == "<p>Post 1</p>"
+        assert entries[1].find(f"{ATOM}summary").text == "<Summary>"
+
+    def test_rss(self):
+        channel = ElementTree.fromstring(self.write(write_rss)).find("channel")
+        items = channel.findall("item")
+        assert [item.find("link").text for item in items] == [entry["url"] for entry in self.entries]
+        assert items[0].find("description").text == "<Summary>"
+        assert items[2].find("pubDate").text == "Sun, 09 Sep 2001 01:46:38 GMT"
+
+    def test_json(self):
+        feed = json.loads(self.write(write_json))
+        assert feed["title"] == "Blog & news"
+        assert [item["title"] for item in feed["items"]] == ["Post 0", "Post 1", "Post 2"]
+        assert feed["items"][1]["content_html"] == "<p>Post 1</p>"
+        assert feed["items"][1]["date_published"] == "2001-09-09T01:46:39+00:00"
+        assert feed["items"][1]["date_modified"] == "2001-09-09T01:46:41+00:00"
+
+    def test_json_empty(self):
+        file = io.BytesIO()
+        write_json(file, self.feed, [])
+        assert json.loads(file.getvalue())["items"] == []
+
+
+class TestFeedEntries(unittest.TestCase):
+    """Test the entries of the feeds made from the records of the pages."""
+    def test_entry(self):
+        page = SimpleNamespace(
+            file=SimpleNamespace(src_path="blog/post.md"), title="Post",
+            canonical_url="https://example.com/blog/post/", url="blog/post/",
+            meta={"description": "Description"},
+        )
+        times = PageTimes(1000000000, 1000100000, "", "")
+        record = PostRecord(page, times, content='<p><a href="../other/">Other</a></p>')
+        entry = BloggingPlugin().get_feed_entry(record, True)
+        # Dates of the entry regardless of the sort of the blog
+        assert (entry["published"], entry["updated"]) == (1000000000, 1000100000)
+        assert entry["content"] == '<p><a href="https://example.com/blog/other/">Other</a></p>'
+
+        assert BloggingPlugin().get_feed_entry(record, False)["content"] is None
+
+    def test_absolute_links(self):
+        base = "https://example.com/blog/post/"
+        html = ('<p><a href="#top" title="a > b">Top</a> <a href=\'https://other.org/\'>Other</a> '
+                '<img src=../img.png alt="Image" srcset="a.png 1x, /b.png 2x"> '
+                '<a href=page/ class=link>Page</a> <a name="anchor">Anchor</a></p>')
+        assert absolute_links(html, base) == (
+            '<p><a href="https://example.com/blog/post/#top" title="a > b">Top</a> '
+            '<a href=\'https://other.org/\'>Other</a> '
+            '<img src=https://example.com/blog/img.png alt="Image" '
+            'srcset="https://example.com/blog/post/a.png 1x, https://example.com/b.png 2x"> '
+            '<a href=https://example.com/blog/post/page/ class=link>Page</a> <a name="anchor">Anchor</a></p>')
+
+
+if __name__ == '__main__':
+    unittest.main()
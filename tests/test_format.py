@@ -1,10 +1,14 @@
 import datetime
 import os
+import tempfile
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
 
+from babel.dates import format_date, format_datetime
+
 from mkdocs_blogging_plugin.plugin import BloggingPlugin
+from mkdocs_blogging_plugin.util import Util
 
 FILE_PATH = Path(os.path.realpath(__file__))
 
@@ -65,3 +69,34 @@ class TestPluginFormatting(unittest.TestCase):
         page = self.plugin.with_timestamp(page, False)
 
         assert page.meta["localized-time"] == "2023/04/12 09:15:30"
+
+    def test_source_time(self):
+        """The time of a page is found before the page is read, to skip git."""
+        with tempfile.TemporaryDirectory() as tmp:
+            dated, undated = os.path.join(tmp, "dated.md"), os.path.join(tmp, "undated.md")
+            with open(dated, "w") as file:
+                file.write("---\ntime: 2022-05-03 11:09:00\n---\n\n# Dated\n")
+            with open(undated, "w") as file:
+                file.write("# Undated\n")
+
+            assert self.plugin.get_source_time(SimpleNamespace(abs_src_path=dated)) == \
+                datetime.datetime(2022, 5, 3, 11, 9).timestamp()
+            assert self.plugin.get_source_time(SimpleNamespace(abs_src_path=undated)) is None
+
+    def test_localized_date(self):
+        timestamps = [0, 1000000000, 1681353600]
+        for locale in ["en_US", "zh_CN", "de_DE"]:
+            expected = [format_datetime(datetime.datetime.fromtimestamp(timestamp),
+                                        format="short", locale=locale)
+                        for timestamp in timestamps]
+            assert [Util.get_localized_date(timestamp, False, _locale=locale) for timestamp in timestamps] == expected
+
+            expected = [format_date(datetime.date.fromtimestamp(timestamp),
+                                    format="short", locale=locale)
+                        for timestamp in timestamps]
+            assert [Util.get_localized_date(timestamp, True, _locale=locale) for timestamp in timestamps] == expected
+
+    def test_month(self):
+        assert Util.get_date_formatter(True, None, "en_US").format_month(2023, 4) == "April 2023"
+        assert Util.get_date_formatter(True, None, "zh_CN").format_month(2023, 4) == "2023年4月"
+        assert Util.get_date_formatter(True, "%Y", None).format_month(2023, 4) == "April 2023"
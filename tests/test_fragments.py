@@ -0,0 +1,88 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+
+from mkdocs_blogging_plugin.plugin import BloggingPlugin
+
+from .site import Site, post
+
+
+def fail():
+    raise AssertionError("rendered again")
+
+
+class TestFragmentCache(unittest.TestCase):
+    """Test reusing rendered blogs from the disk across builds."""
+    def get_plugin(self, cache_dir, context="context"):
+        plugin = BloggingPlugin()
+        plugin.util.cache_dir = cache_dir
+        plugin.fragment_context = context
+        return plugin
+
+    def test_reuse(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            key, signature = ("blog", "global", 0), (("blog/post.md", "hash", 1000000000),)
+            assert self.get_plugin(cache_dir).render_cached(key, signature, lambda: "<p>Blog</p>") == \
+                "<p>Blog</p>"
+
+            # Another build with the same inputs
+            plugin = self.get_plugin(cache_dir)
+            assert plugin.render_cached(key, signature, fail) == "<p>Blog</p>"
+
+            # Changed pages or context
+            assert plugin.render_cached(key, signature + (("new.md", "hash", 1),),
+                                        lambda: "<p>New</p>") == "<p>New</p>"
+            plugin = self.get_plugin(cache_dir, "changed")
+            assert plugin.render_cached(key, signature, lambda: "<p>Changed</p>") == "<p>Changed</p>"
+
+            # Only the fragments of the last build are kept
+            plugin.prune_fragments()
+            assert len(os.listdir(os.path.join(cache_dir, "fragments"))) == 1
+
+
+class TestFragmentContext(unittest.TestCase):
+    """Test that cached fragments follow what the templates read from the mkdocs config."""
+    def test_extra(self):
+        site = Site({"dirs": ["blog"], "template": "custom.html", "features": {"cache": {}}}, {
+            "index.md": "{{ blog_content }}\n",
+            "blog/post.md": post("Post", datetime.date(2023, 1, 1)),
+        }, extra={"greeting": "Hello"})
+        site.write("custom.html", '{% extends "blog.html" %}\n'
+                                "{% block style %}{{ mkdocs_context.config.extra.greeting }}{% endblock %}\n")
+        try:
+            site.build()
+            assert "Hello" in site.read("index.html")
+
+            site.write_config(dict(site.config, extra={"greeting": "Bye"}))
+            site.build()
+            assert "Bye" in site.read("index.html")
+        finally:
+            site.cleanup()
+
+
+    def test_static_pages(self):
+        """Editing a post only renders again the page showing it."""
+        docs = {"index.md": "{{ blog_content }}\n"}
+        for i in range(4):
+            docs[f"blog/p{i}.md"] = post(f"Post {i}", datetime.date(2023, 1, i + 1))
+        site = Site({"dirs": ["blog"], "size": 1, "static_paging": True,
+                     "features": {"cache": {}, "profile": {}}}, docs)
+        try:
+            site.build()
+            site.write_docs({"blog/p1.md": post("Post 1 edited", datetime.date(2023, 1, 2))})
+            site.build()
+
+            with open(site.path("blogging-profile.json")) as file:
+                counters = json.load(file)["counters"]
+            # Only the page with the edited post is rendered again
+            assert counters["render_cache_hits"] == 3
+            assert counters["render_cache_misses"] == 1
+            assert "Post 1 edited" in site.read("page-3.html")
+        finally:
+            site.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
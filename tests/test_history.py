@@ -0,0 +1,241 @@
+import logging
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from mkdocs_blogging_plugin.history import HistoryIndex
+from mkdocs_blogging_plugin.util import Util
+
+
+def git(cwd, *args, timestamp=None):
+    env = dict(os.environ)
+    if timestamp is not None:
+        env["GIT_AUTHOR_DATE"] = f"{timestamp} +0000"
+        env["GIT_COMMITTER_DATE"] = f"{timestamp} +0000"
+    subprocess.run(["git", *args], cwd=cwd, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+class TestHistoryIndex(unittest.TestCase):
+    """Test timestamps read from a single walk over the git history."""
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.root = Path(cls.tmp.name)
+        blog = cls.root / "docs" / "blog"
+        blog.mkdir(parents=True)
+
+        git(cls.root, "init", "-q")
+        git(cls.root, "config", "user.name", "test")
+        git(cls.root, "config", "user.email", "test@example.com")
+
+        (blog / "first post.md").write_text("# First\n")
+        (blog / "second.md").write_text("# Second\n")
+        (blog / "deleted.md").write_text("# Deleted\n")
+        git(cls.root, "add", "-A")
+        git(cls.root, "commit", "-qm", "1", timestamp=1000000000)
+
+        git(cls.root, "mv", "docs/blog/first post.md", "docs/blog/renamed.md")
+        git(cls.root, "rm", "-q", "docs/blog/deleted.md")
+        git(cls.root, "commit", "-qm", "2", timestamp=1000001000)
+
+        (blog / "second.md").write_text("# Second\n\nUpdated\n")
+        git(cls.root, "commit", "-qam", "3", timestamp=1000002000)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_index(self):
+        index = HistoryIndex()
+        index.update(Util()._get_repo(self.tmp.name).git)
+
+        assert index.get("docs/blog/second.md") == (1000000000, 1000002000)
+        assert index.get("docs/blog/renamed.md") == (1000000000, 1000001000)
+        assert index.get("docs/blog/first post.md") is None
+        assert index.get("docs/blog/deleted.md") is None
+
+    def test_util_timestamp(self):
+        util = Util()
+        path = (self.root / "docs" / "blog" / "renamed.md").as_posix()
+        assert util.get_git_commit_timestamp(path, is_first_commit=True) == 1000000000
+        assert util.get_git_commit_timestamp(path, is_first_commit=False) == 1000001000
+
+    def test_util_timestamps_without_index(self):
+        util = Util()
+        path = (self.root / "docs" / "blog" / "renamed.md").as_posix()
+        # Falls back to one `git log` of the file for both timestamps
+        util.history_cache[os.path.realpath(self.tmp.name)] = None
+        assert util.get_git_commit_timestamps(path) == (1000000000, 1000001000)
+        Util.get_git_commit_timestamps.cache_clear()
+
+    def test_prefetch(self):
+        Util.get_git_commit_timestamps.cache_clear()
+        util = Util()
+        paths = [(self.root / "docs" / "blog" / name).as_posix() for name in ("renamed.md", "second.md")]
+        with tempfile.TemporaryDirectory() as tmp:
+            outside = os.path.join(tmp, "post.md")
+            with self.assertLogs("mkdocs.plugins", "DEBUG") as logs:
+                # Files in a repository with an index are looked up without threads
+                with mock.patch("mkdocs_blogging_plugin.util.ThreadPoolExecutor",
+                                side_effect=AssertionError("threads used")):
+                    util.prefetch_git_commit_timestamps(paths + [outside])
+            # Files outside a repository are skipped quietly
+            assert not [record for record in logs.records if record.levelno >= logging.WARNING]
+
+        assert Util.get_git_commit_timestamps.cache_info().currsize == 2
+        hits = Util.get_git_commit_timestamps.cache_info().hits
+        assert util.get_git_commit_timestamps(paths[1]) == (1000000000, 1000002000)
+        assert Util.get_git_commit_timestamps.cache_info().hits == hits + 1
+        Util.get_git_commit_timestamps.cache_clear()
+
+        # Without an index, files are queried one by one, concurrently
+        util = Util()
+        util.history_cache[os.path.realpath(self.tmp.name)] = None
+        util.prefetch_git_commit_timestamps(paths, max_workers=2)
+        assert Util.get_git_commit_timestamps.cache_info().currsize == 2
+        assert util.get_git_commit_timestamps(paths[0]) == (1000000000, 1000001000)
+        Util.get_git_commit_timestamps.cache_clear()
+
+    def test_refresh_without_commits(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            git(tmp, "init", "-q")
+            path = os.path.join(tmp, "post.md")
+            with open(path, "w") as file:
+                file.write("# Post\n")
+
+            util = Util()
+            with self.assertLogs("mkdocs.plugins", "WARNING"):
+                util.get_git_commit_timestamps(path)
+            assert util.history_cache == {os.path.realpath(tmp): None}
+            # Nothing changed until the first commit
+            assert not util.refresh()
+
+            git(tmp, "-c", "user.name=test", "-c", "user.email=test@example.com",
+                "commit", "-q", "--allow-empty", "-m", "1")
+            assert util.refresh()
+            assert util.history_cache == {}
+            Util.get_git_commit_timestamps.cache_clear()
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            util = Util()
+            util.cache_dir = cache_dir
+            path = (self.root / "docs" / "blog" / "second.md").as_posix()
+            assert util.get_git_commit_timestamp(path, is_first_commit=False) == 1000002000
+
+            cache = Util()
+            cache.cache_dir = cache_dir
+            entry = cache._load_cache()[cache._get_cache_key(os.path.realpath(self.tmp.name))]
+            assert entry["head"] == util._get_repo(path).git.rev_parse("HEAD")
+            assert entry["entries"]["docs/blog/second.md"] == [1000000000, 1000002000]
+
+    def test_manifest(self):
+        docs = self.root / "docs"
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = os.path.join(tmp, "timestamps.json")
+            draft = docs / "blog" / "draft.md"
+            draft.write_text("# Draft\n")
+            try:
+                with self.assertLogs("mkdocs.plugins", "WARNING"):
+                    count = Util().write_manifest(
+                        manifest, docs.as_posix(), ["blog/renamed.md", "blog/second.md", "blog/draft.md"])
+            finally:
+                draft.unlink()
+            # The build time of the untracked draft is not saved as its commit time
+            assert count == 2
+
+            util = Util()
+            util.load_manifest(manifest, docs.as_posix())
+            assert util.manifest == {"blog/renamed.md": [1000000000, 1000001000],
+                                     "blog/second.md": [1000000000, 1000002000]}
+
+            # Timestamps are read from the manifest only
+            util.manifest["blog/second.md"] = [1, 2]
+            path = (docs / "blog" / "second.md").as_posix()
+            assert util.get_git_commit_timestamp(path, is_first_commit=True) == 1
+            assert util.get_git_commit_timestamp(path, is_first_commit=False) == 2
+            assert util.history_cache == {}
+            Util.get_git_commit_timestamps.cache_clear()
+
+
+
+class TestIncrementalHistory(unittest.TestCase):
+    """Test updating the history index with the commits made since it was built."""
+    def setUp(self):
+        Util.get_git_commit_timestamps.cache_clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name, "repo")
+        self.root.mkdir()
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.post = (self.root / "post.md").as_posix()
+
+        git(self.root, "init", "-q")
+        git(self.root, "config", "user.name", "test")
+        git(self.root, "config", "user.email", "test@example.com")
+        (self.root / "post.md").write_text("# Post\n")
+        git(self.root, "add", "-A")
+        git(self.root, "commit", "-qm", "1", timestamp=1000000000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        Util.get_git_commit_timestamps.cache_clear()
+
+    def get_util(self) -> Util:
+        util = Util()
+        util.cache_dir = self.cache_dir
+        return util
+
+    def head(self) -> str:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=self.root, check=True,
+                              stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+
+    def resolve(self, util) -> tuple:
+        """Resolve the post, along with the revisions walked by the index."""
+        with mock.patch.object(HistoryIndex, "update", autospec=True,
+                               side_effect=HistoryIndex.update) as update:
+            timestamps = util.get_git_commit_timestamps(self.post)
+        return timestamps, [call[0][2] for call in update.call_args_list]
+
+    def test_ancestor(self):
+        util = self.get_util()
+        first = self.head()
+        assert self.resolve(util)[1] == [first]
+
+        (self.root / "post.md").write_text("# Post\n\nUpdated\n")
+        git(self.root, "commit", "-qam", "2", timestamp=1000001000)
+        assert util.refresh()
+        # Only the new commits are walked
+        assert self.resolve(util) == ((1000000000, 1000001000), [f"{first}..{self.head()}"])
+        assert not util.refresh()
+
+    def test_rewritten(self):
+        util = self.get_util()
+        self.resolve(util)
+
+        git(self.root, "commit", "-q", "--amend", "--reset-author", "-m", "1b", timestamp=1000002000)
+        assert util.refresh()
+        # The cached head is not an ancestor, so the whole history is walked again
+        assert self.resolve(util) == ((1000002000, 1000002000), [self.head()])
+
+    def test_reload(self):
+        first = self.head()
+        self.resolve(self.get_util())
+        assert os.path.isfile(os.path.join(self.cache_dir, "timestamps.json"))
+
+        # Another build reads the index from the cache file, without walking the history
+        Util.get_git_commit_timestamps.cache_clear()
+        assert self.resolve(self.get_util()) == ((1000000000, 1000000000), [])
+
+        (self.root / "other.md").write_text("# Other\n")
+        git(self.root, "add", "-A")
+        git(self.root, "commit", "-qm", "2", timestamp=1000001000)
+        Util.get_git_commit_timestamps.cache_clear()
+        assert self.resolve(self.get_util()) == ((1000000000, 1000000000), [f"{first}..{self.head()}"])
+
+
+if __name__ == '__main__':
+    unittest.main()
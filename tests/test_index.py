@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from mkdocs_blogging_plugin.index import DirectoryTrie, TagIndex
+
+
+class TestDirectoryTrie(unittest.TestCase):
+    """Test looking up the categories including a page."""
+    @classmethod
+    def setUpClass(cls):
+        cls.trie = DirectoryTrie()
+        cls.trie.add("blog", "global")
+        cls.trie.add("./blog/reviews/", "reviews")
+        cls.trie.add("notes", "reviews")
+        cls.trie.add("blog", "all")
+        cls.trie.add("notes", "all")
+
+    def test_find(self):
+        assert self.trie.find("blog/post.md") == ["global", "all"]
+        assert self.trie.find("blog/reviews/2021/post.md") == ["global", "reviews", "all"]
+        assert self.trie.find("notes/post.md") == ["reviews", "all"]
+
+    def test_not_found(self):
+        assert self.trie.find("index.md") == []
+        assert self.trie.find("blog.md") == []
+        assert self.trie.find("blogs/post.md") == []
+
+    def test_root(self):
+        trie = DirectoryTrie()
+        trie.add(".", "global")
+        assert trie.find("index.md") == ["global"]
+        assert trie.find("blog/post.md") == ["global"]
+
+
+class TestTagIndex(unittest.TestCase):
+    """Test finding related pages by their tags."""
+    @classmethod
+    def setUpClass(cls):
+        cls.index = TagIndex()
+        cls.index.add("a.md", ["python", "mkdocs", "rare"], timestamp=1)
+        cls.index.add("b.md", ["python", "mkdocs"], timestamp=2)
+        cls.index.add("c.md", ["python"], timestamp=3)
+        cls.index.add("d.md", ["rare"], timestamp=4)
+        cls.index.add("e.md", ["cooking"], timestamp=5)
+        cls.index.add("f.md", ["python"], timestamp=6)
+
+    def test_related(self):
+        assert self.index.related("b.md", 10) == ["a.md", "f.md", "c.md"]
+        # A rare tag counts more than a popular one
+        assert self.index.related("a.md", 2) == ["b.md", "d.md"]
+        assert self.index.related("e.md", 3) == []
+        assert self.index.related("x.md", 3) == []
+        assert self.index.related("a.md", 0) == []
+
+    def test_same_as_all_pairs(self):
+        rng = random.Random(0)
+        tags = [f"tag-{i}" for i in range(30)]
+        index = TagIndex()
+        for i in range(300):
+            index.add(f"{i}.md", rng.choices(tags, [1 / (j + 1) for j in range(30)],
+                                             k=rng.randint(1, 5)), timestamp=i)
+
+        def score(key, other):
+            return round(sum(index.weight(tag) for tag in index.tags[key] & index.tags[other]), 9)
+
+        for key in index.tags:
+            expected = sorted((score(key, other) for other in index.tags
+                               if other != key and index.tags[key] & index.tags[other]),
+                              reverse=True)[:5]
+            assert [score(key, other) for other in index.related(key, 5)] == expected
+
+
+if __name__ == '__main__':
+    unittest.main()
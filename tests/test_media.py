@@ -0,0 +1,33 @@
+import unittest
+
+from mkdocs_blogging_plugin.media import defer_media, lazy_media
+
+
+class TestMedia(unittest.TestCase):
+    """Test rewriting the media in the content of articles."""
+    def test_lazy(self):
+        assert lazy_media('<p><img src="a.png" alt="a > b"/></p>') == \
+            '<p><img loading="lazy" decoding="async" src="a.png" alt="a > b"/></p>'
+        assert lazy_media('<iframe src="https://example.com"></iframe>') == \
+            '<iframe loading="lazy" src="https://example.com"></iframe>'
+        assert lazy_media('<video controls><source src="a.mp4"></video>') == \
+            '<video preload="none" controls><source src="a.mp4"></video>'
+
+    def test_lazy_kept(self):
+        html = '<img src="a.png" loading="eager" decoding="sync"><video preload="auto">'
+        assert lazy_media(html) == html
+        # Escaped tags in code are not media
+        html = '<code>&lt;img src="a.png"&gt;</code>'
+        assert lazy_media(html) == html
+
+    def test_defer(self):
+        assert defer_media('<img src="a.png" srcset="a-2x.png 2x" alt="src=b.png">') == \
+            '<img data-blogging-deferred data-src="a.png" data-srcset="a-2x.png 2x" alt="src=b.png">'
+        assert defer_media('<video poster="a.png"><source src="a.mp4"></video>') == \
+            '<video data-blogging-deferred data-poster="a.png">' \
+            '<source data-blogging-deferred data-src="a.mp4"></video>'
+        assert defer_media('<img alt="no source">') == '<img alt="no source">'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import datetime
+import unittest
+
+from .site import Site, post
+
+
+class TestMixedPaging(unittest.TestCase):
+    """Test a page with a blog split into files and a blog paged by the script."""
+    @classmethod
+    def setUpClass(cls):
+        docs = {"index.md": "# Blogs\n\n{{ blog_content news }}\n\n{{ blog_content notes }}\n"}
+        for i in range(2):
+            docs[f"news/n{i}.md"] = post(f"News {i}", datetime.date(2023, 1, i + 1))
+            docs[f"notes/m{i}.md"] = post(f"Note {i}", datetime.date(2023, 2, i + 1))
+
+        cls.site = Site({
+            "categories": [
+                {"name": "news", "dirs": ["news"], "size": 1, "static_paging": True},
+                {"name": "notes", "dirs": ["notes"], "size": 1},
+            ]
+        }, docs)
+        cls.site.build()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.site.cleanup()
+
+    def test_script_on_every_file(self):
+        for html in (self.site.read("index.html"), self.site.read("page-2.html")):
+            assert html.count("getElementsByClassName(\"blog-paged\")") == 1
+            # Only the blog paged by the script is switched by it
+            assert html.count("blog-paged") == 2
+            assert "Note 0" in html and "Note 1" in html
+
+        assert "News 1" in self.site.read("index.html") and "News 0" not in self.site.read("index.html")
+        assert "News 0" in self.site.read("page-2.html")
+
+
+if __name__ == '__main__':
+    unittest.main()
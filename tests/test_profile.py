@@ -0,0 +1,49 @@
+import json
+import unittest
+
+from mkdocs_blogging_plugin.util import Util
+
+from .site import Site
+
+
+class TestProfile(unittest.TestCase):
+    """Test the report written by the profile feature."""
+    def setUp(self):
+        Util.get_git_commit_timestamps.cache_clear()
+        docs = {"index.md": "{{ blog_content }}\n"}
+        for i in range(3):
+            docs[f"blog/p{i}.md"] = f"# Post {i}\n"
+        self.site = Site({"dirs": ["blog"], "features": {
+            "profile": {"path": "profile.json", "slowest": 2},
+            "manifest": {"path": "timestamps.json"},
+        }}, docs)
+
+    def tearDown(self):
+        self.site.cleanup()
+        Util.get_git_commit_timestamps.cache_clear()
+
+    def read_report(self) -> dict:
+        with open(self.site.path("profile.json")) as file:
+            return json.load(file)
+
+    def test_report(self):
+        config = self.site.load_config()
+        with self.assertLogs("mkdocs.plugins", "WARNING"):
+            self.site.build(config)
+        report = self.read_report()
+        assert report["counters"]["timestamp_lru_misses"] == 3
+        assert report["timings"]["on_post_page"]["calls"] == 4
+        assert len(report["slowest_pages"]) == 2
+        assert list(report["renders"]) == ["blog global 0"]
+
+        # A new manifest clears the cached timestamps before the next build
+        pages = {f"blog/p{i}.md": [1000000000 + i, 1000000000 + i] for i in range(3)}
+        self.site.write("timestamps.json", json.dumps({"version": 1, "pages": pages}))
+        self.site.build(config)
+        counters = self.read_report()["counters"]
+        assert counters["timestamp_lru_misses"] == 3
+        assert all(value >= 0 for value in counters.values())
+
+
+if __name__ == '__main__':
+    unittest.main()
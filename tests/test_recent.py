@@ -0,0 +1,54 @@
+import datetime
+import re
+import unittest
+
+from .site import Site, post
+
+OVERRIDE = """{% extends "base.html" %}
+{% block content %}
+{{ super() }}
+<ul class="recent">
+{% for name, pages in recent_pages|dictsort %}{% for pg in pages %}
+<li>{{ name }}: {{ pg.title }}</li>
+{% endfor %}{% endfor %}
+</ul>
+{% endblock %}
+"""
+
+
+class TestRecent(unittest.TestCase):
+    """Test the newest articles of the categories shown on every page."""
+    @classmethod
+    def setUpClass(cls):
+        docs = {"index.md": "{{ blog_content }}\n", "about.md": "# About\n"}
+        # Written out of order, to be sorted by their dates
+        for i in (2, 0, 3, 1):
+            docs[f"blog/p{i}.md"] = post(f"Post {i}", datetime.date(2023, 1, i + 1))
+            docs[f"news/n{i}.md"] = post(f"News {i}", datetime.date(2023, 2, i + 1))
+
+        cls.site = Site({
+            "dirs": ["blog"],
+            "categories": [{"name": "news", "dirs": ["news"]}],
+            "features": {"recent": {"count": 2, "categories": ["global", "news"]}},
+        }, docs, theme={"name": "mkdocs", "custom_dir": "overrides"},
+            nav=["index.md", "about.md"])
+        cls.site.write("overrides/main.html", OVERRIDE)
+        cls.site.build()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.site.cleanup()
+
+    def get_recent(self, *names) -> list:
+        html = self.site.read(*names)
+        return re.findall(r"<li>(.*?)</li>", html.split('<ul class="recent">')[1])
+
+    def test_every_page(self):
+        recent = ["global: Post 3", "global: Post 2", "news: News 3", "news: News 2"]
+        assert self.get_recent("index.html") == recent
+        assert self.get_recent("about", "index.html") == recent
+        assert self.get_recent("blog", "p0", "index.html") == recent
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from types import SimpleNamespace
+
+from mkdocs_blogging_plugin.records import PageTimes, PostRecord
+
+
+class TestPostRecord(unittest.TestCase):
+    """Test records keeping what the templates need only."""
+    def test_record(self):
+        page = SimpleNamespace(
+            file=SimpleNamespace(src_path="blog/post.md"), title="Post",
+            canonical_url="https://example.com/blog/post/", url="blog/post/",
+            content="<p>Content</p>",
+            meta={"tags": ["a", "b"], "description": "Description", "author": "Me"},
+        )
+        times = PageTimes(1000000000, 1000100000, "9/9/01", "9/10/01")
+        record = PostRecord(page, times)
+        assert record.src_path == "blog/post.md"
+        assert record.tags == ["a", "b"]
+        assert record.description == "Description"
+        assert record.meta["author"] == "Me"
+        assert record.excerpt is None
+        # The content is only kept if given
+        assert record.content is None
+        assert not hasattr(record, "__dict__")
+
+        # Both times are kept, the sort picks one
+        assert (record.timestamp, record.localized_time) == (1000000000, "9/9/01")
+        record = PostRecord(page, times, by_revision=True)
+        assert (record.timestamp, record.localized_time) == (1000100000, "9/10/01")
+        assert (record.created, record.localized_updated) == (1000000000, "9/10/01")
+
+    def test_digest(self):
+        page = SimpleNamespace(file=SimpleNamespace(src_path="post.md"), title="Post",
+                               canonical_url=None, url="post/", meta={})
+        times = PageTimes(0, 0, "", "")
+        digest = PostRecord(page, times, content="<p>Old</p>").digest()
+        assert PostRecord(page, times, content="<p>Old</p>").digest() == digest
+        # Same source with different html, e.g. from an included file
+        assert PostRecord(page, times, content="<p>New</p>").digest() != digest
+
+    def test_invalid_tags(self):
+        page = SimpleNamespace(file=SimpleNamespace(src_path="post.md"), title=None,
+                               canonical_url=None, url="post/", meta={"tags": "a"})
+        assert PostRecord(page, PageTimes(0, 0, "", "")).tags == []
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+
+from mkdocs_blogging_plugin.search import filter_search_index, filter_search_index_file
+
+
+def get_index():
+    return {
+        "config": {"lang": ["en"]},
+        "docs": [
+            {"location": "", "title": "Blog", "text": "All the articles"},
+            {"location": "#blog", "title": "Blog", "text": "All the articles"},
+            {"location": "blog/post/", "title": "Post", "text": "Article"},
+            {"location": "tags/", "title": "Tags", "text": "Tagged articles"},
+            {"location": "tags/#python", "title": "python", "text": "Tagged articles"},
+        ],
+    }
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test removing the blog pages from the search index."""
+    def test_titles(self):
+        index = get_index()
+        assert filter_search_index(index, {"": "titles", "tags/": "titles"}) == 4
+        assert index["docs"] == [
+            {"location": "", "title": "Blog", "text": ""},
+            {"location": "blog/post/", "title": "Post", "text": "Article"},
+            {"location": "tags/", "title": "Tags", "text": ""},
+        ]
+
+    def test_none(self):
+        index = get_index()
+        assert filter_search_index(index, {"tags/": "none"}) == 2
+        assert [entry["location"] for entry in index["docs"]] == ["", "#blog", "blog/post/"]
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "search_index.json")
+            with open(path, "w") as file:
+                json.dump(get_index(), file)
+            filter_search_index_file(path, {"": "none"})
+            with open(path) as file:
+                assert len(json.load(file)["docs"]) == 3
+
+            # Prebuilt indexes are left as is
+            with open(path, "w") as file:
+                json.dump(dict(get_index(), index={}), file)
+            with self.assertLogs("mkdocs.plugins", level="WARNING"):
+                filter_search_index_file(path, {"": "none"})
+            with open(path) as file:
+                assert len(json.load(file)["docs"]) == 5
+
+
+if __name__ == '__main__':
+    unittest.main()
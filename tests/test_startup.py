@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SCRIPT = """
+import sys
+# Imported by mkdocs itself
+import jinja2, mkdocs.config.config_options, mkdocs.plugins, mkdocs.utils
+before = set(sys.modules)
+
+import mkdocs_blogging_plugin.plugin
+from mkdocs_blogging_plugin.plugin import get_scripts
+
+print(" ".join(sorted(set(sys.modules) - before)))
+print(get_scripts.cache_info().currsize)
+"""
+
+BUILD_SCRIPT = """
+import sys
+from mkdocs.commands.build import build
+from mkdocs.config import load_config
+
+build(load_config(config_file=sys.argv[1]))
+print(" ".join(sorted(sys.modules)))
+"""
+
+CONFIG = """
+site_name: Test
+site_url: https://example.com/
+plugins:
+  - blogging:
+      dirs: [blog]
+      features:
+        tags: {}
+"""
+
+
+class TestStartup(unittest.TestCase):
+    """Test that loading the plugin does not pay for what a build may not need."""
+    def test_lazy_imports(self):
+        output = subprocess.run([sys.executable, "-c", SCRIPT], stdout=subprocess.PIPE,
+                                check=True, universal_newlines=True).stdout.splitlines()
+        modules = output[0].split()
+        for prefix in ("git", "babel", "xml"):
+            assert not [name for name in modules if name.split(".")[0] == prefix], modules
+        # The script of the pagination is not read yet
+        assert output[1] == "0"
+
+    def test_dated_build(self):
+        """A site with the time of every article in its meta never needs git."""
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "docs", "blog"))
+            with open(os.path.join(tmp, "mkdocs.yml"), "w") as file:
+                file.write(CONFIG)
+            with open(os.path.join(tmp, "docs", "index.md"), "w") as file:
+                file.write("---\ndate: 2023-01-01\n---\n\n{{ blog_content }}\n")
+            for i in range(3):
+                with open(os.path.join(tmp, "docs", "blog", f"post-{i}.md"), "w") as file:
+                    file.write(f"---\ndate: 2023-01-0{i + 1}\ntags: [a]\n---\n\n# Post {i}\n")
+
+            output = subprocess.run(
+                [sys.executable, "-c", BUILD_SCRIPT, os.path.join(tmp, "mkdocs.yml")],
+                stdout=subprocess.PIPE, check=True, universal_newlines=True
+            ).stdout.splitlines()
+            assert os.path.exists(os.path.join(tmp, "site", "blog", "post-0", "index.html"))
+            assert "git" not in output[-1].split()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,3 +33,16 @@ class TestPluginFormatting(unittest.TestCase):
     def test_template(self):
         assert self.plugin.jinja_templates["global"].filename.split("/")[-1] == "template.html"
         assert self.plugin.jinja_templates["c1"].filename.split("/")[-1] == "template.html"
+
+    def test_tags_template(self):
+        # Tags can be other scalars than strings in YAML
+        html = self.plugin.tags_template.render(tags=[2023, "a"], index_url="https://example.com/tags/")
+        assert 'href="https://example.com/tags/#2023"' in html
+
+    def test_tag_paths(self):
+        plugin = BloggingPlugin()
+        plugin.tags_index_dest = "tags/index.html"
+        # Tags with the same slug have distinct pages, kept on later lookups
+        assert plugin.get_tag_path("C++") == "tags/tag-c.html"
+        assert plugin.get_tag_path("C#") == "tags/tag-c-2.html"
+        assert plugin.get_tag_path("C++") == "tags/tag-c.html"